@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from django.db.models.signals import pre_migrate
+
+        from accounts import signals
+
+        # UniqueConstraint 추가 전에 기존 중복 스팀 데이터 정리
+        pre_migrate.connect(signals.remove_duplicate_steam_rows, sender=self)
@@ -0,0 +1,88 @@
+import json
+import os
+import uuid
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+
+# 스냅샷 파일 형식 버전 (열 구성이 바뀌면 올림)
+SNAPSHOT_FORMAT = 1
+
+MANIFEST_NAME = "manifest.json"
+
+
+def get_snapshot_dir(directory=None):
+    return Path(directory or settings.CATALOGUE_SNAPSHOT_DIR)
+
+
+def _current_snapshot_id(directory):
+    """
+    현재 manifest의 스냅샷 id (없거나 읽을 수 없으면 None)
+    """
+    try:
+        with open(directory / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f).get("snapshot_id")
+    except (OSError, ValueError):
+        return None
+
+
+def save_catalogue_snapshot(manifest, columns, directory=None):
+    """
+    열 단위 NumPy 배열(.npy)과 manifest.json 저장
+    - 배열 파일 이름에 스냅샷 id를 붙이고 manifest를 마지막에 교체 -> 읽는 쪽은 항상 완성된 스냅샷만 봄
+    - 직전 스냅샷 파일은 다음 저장 때까지 유지 (이전 manifest를 읽고 아직 열지 않은 프로세스용)
+      그보다 오래된 스냅샷 파일만 삭제
+    """
+    directory = get_snapshot_dir(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    snapshot_id = uuid.uuid4().hex[:12]
+    previous = _current_snapshot_id(directory)
+
+    files = {}
+    for name, array in columns.items():
+        file_name = f"{name}.{snapshot_id}.npy"
+        np.save(directory / file_name, np.ascontiguousarray(array))
+        files[name] = {"file": file_name, "dtype": str(array.dtype), "length": int(len(array))}
+
+    manifest = {
+        **manifest,
+        "format": SNAPSHOT_FORMAT,
+        "snapshot_id": snapshot_id,
+        "created_at": timezone.now().isoformat(),
+        "columns": files,
+    }
+    temp_path = directory / f"{MANIFEST_NAME}.{snapshot_id}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(temp_path, directory / MANIFEST_NAME)
+
+    keep = {snapshot_id, previous}
+    for path in directory.glob("*.npy"):
+        if path.name.rsplit(".", 2)[-2] not in keep:
+            path.unlink(missing_ok=True)
+    return manifest
+
+
+def load_catalogue_snapshot(directory=None):
+    """
+    저장된 스냅샷 (manifest, 열 이름 -> 읽기 전용 mmap 배열) 반환 (없으면 None)
+    """
+    directory = get_snapshot_dir(directory)
+    if not (directory / MANIFEST_NAME).exists():
+        return None
+    try:
+        with open(directory / MANIFEST_NAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            return None
+        columns = {
+            name: np.load(directory / info["file"], mmap_mode="r")
+            for name, info in manifest["columns"].items()
+        }
+    except (OSError, ValueError, KeyError) as e:
+        print(f"카탈로그 스냅샷 로드 실패: {e!r}")
+        return None
+    return manifest, columns
@@ -0,0 +1,110 @@
+import heapq
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.recommend import POPULAR_OWNERS, CatalogueMatrix
+from accounts.tag_index import OWNERS_RANGES
+
+
+def make_catalogue(size, seed=0):
+    """
+    임의의 게임 카탈로그 행 생성 (CatalogueMatrix.from_rows 형식)
+    """
+    rng = random.Random(seed)
+    tags = [f"tag{i}" for i in range(400)]
+    genres = [f"genre{i}" for i in range(30)]
+    categories = [f"category{i}" for i in range(40)]
+    owners = list(OWNERS_RANGES)
+
+    rows = []
+    for app_id in range(1, size + 1):
+        rows.append((
+            app_id,
+            rng.choice([0, 0, 0, 12, 15, 18]),
+            rng.randint(0, 100),
+            rng.randint(0, 8000),
+            rng.choice(owners),
+            {tag: rng.randint(1, 1000) for tag in rng.sample(tags, 20)},
+            rng.sample(genres, 3),
+            rng.sample(categories, 5),
+        ))
+    return rows
+
+
+def legacy_recommend(rows, user_tags, played_tags, age, owned, k=15):
+    """
+    기존 get_recommended_games의 반복문 계산 (비교용)
+    """
+    interest, playtime = [], []
+    for app_id, required_age, metacritic, median_playtime, estimated_owners, tags, genres, categories in rows:
+        if required_age > age or app_id in owned:
+            continue
+        tags = {t.lower() for t in tags}
+        genres = {g.lower() for g in genres}
+        categories = {c.lower() for c in categories}
+        owners_score = OWNERS_RANGES.get(estimated_owners, 0)
+
+        score = (
+            len(user_tags & tags) * 50 + len(user_tags & genres) * 50 + len(user_tags & categories) * 30
+            + int(min(median_playtime / 10, 100)) + owners_score + metacritic
+        )
+        interest.append((app_id, score))
+
+        if 120 <= median_playtime <= 3000:
+            bonus = 50
+        elif 60 <= median_playtime < 120:
+            bonus = 25
+        elif 3000 < median_playtime <= 6000:
+            bonus = 35
+        else:
+            bonus = 10
+        score = (
+            len(played_tags & tags) * 20 + len(played_tags & genres) * 20 + len(played_tags & categories) * 15
+            + bonus + owners_score + metacritic
+        )
+        if metacritic >= 75 or estimated_owners in POPULAR_OWNERS:
+            playtime.append((app_id, score))
+
+    return (
+        heapq.nlargest(k, interest, key=lambda x: x[1]),
+        heapq.nlargest(k, playtime, key=lambda x: x[1]),
+    )
+
+
+class Command(BaseCommand):
+    help = "카탈로그 크기별 추천 점수 계산 시간을 측정합니다. (기존 반복문 방식과 비교)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000])
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        user_tags = {"tag1", "tag7", "genre2", "category3", "tag42"}
+        played_tags = {"tag3", "tag9", "genre5", "category1", "tag100"}
+        owned = set(range(1, 200, 3))
+
+        for size in options["sizes"]:
+            rows = make_catalogue(size)
+
+            start = time.perf_counter()
+            matrix = CatalogueMatrix.from_rows(rows)
+            build = time.perf_counter() - start
+
+            repeat = options["repeat"]
+            start = time.perf_counter()
+            for _ in range(repeat):
+                result = matrix.recommend(user_tags, played_tags, 18, owned)
+            vectorized = (time.perf_counter() - start) / repeat
+
+            start = time.perf_counter()
+            expected = legacy_recommend(rows, user_tags, played_tags, 18, owned)
+            legacy = time.perf_counter() - start
+
+            same = [list(r) for r in result] == [list(e) for e in expected]
+            self.stdout.write(
+                f"{size:>7}개 | 행렬 생성 {build * 1000:8.1f}ms | "
+                f"행렬 계산 {vectorized * 1000:7.2f}ms | 기존 반복문 {legacy * 1000:8.1f}ms | "
+                f"결과 일치: {same}"
+            )
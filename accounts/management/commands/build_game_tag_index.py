@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from accounts.tag_index import rebuild_game_tag_index, refresh_store_game_tags
+
+
+class Command(BaseCommand):
+    help = "Game.tags 데이터로 게임 태그 인덱스(GameTagIndex)를 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--refresh-store",
+            action="store_true",
+            help="데이터셋에 없어 상점 페이지에서 가져온 게임 태그도 다시 크롤링합니다.",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_game_tag_index()
+        self.stdout.write(self.style.SUCCESS(f"게임 태그 인덱스 {count}개 생성 완료."))
+
+        if options["refresh_store"]:
+            count = refresh_store_game_tags()
+            self.stdout.write(self.style.SUCCESS(f"상점 태그 {count}개 갱신 완료."))
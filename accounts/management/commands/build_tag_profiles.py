@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import Account
+from accounts.tag_profile import refresh_stale_tag_profiles, refresh_user_tag_profile
+
+
+class Command(BaseCommand):
+    help = "모든 유저의 취향 태그 프로필(UserTagProfile)을 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale", action="store_true",
+            help="변경되어 다시 계산이 필요한(is_stale) 프로필만 계산",
+        )
+
+    def handle(self, *args, **options):
+        if options["stale"]:
+            count = total = 0
+            while True:
+                count = refresh_stale_tag_profiles()
+                total += count
+                if not count:
+                    break
+            self.stdout.write(self.style.SUCCESS(f"유저 태그 프로필 {total}개 갱신 완료."))
+            return
+
+        count = 0
+        for account in Account.objects.all().iterator():
+            refresh_user_tag_profile(account)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"유저 태그 프로필 {count}개 갱신 완료."))
@@ -0,0 +1,32 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from accounts.catalogue_snapshot import save_catalogue_snapshot
+from accounts.recommend import CatalogueMatrix
+from accounts.tag_index import INDEX_VERSION_KEY, bump_index_version
+
+
+class Command(BaseCommand):
+    help = "추천용 게임 카탈로그를 열 단위 NumPy 파일(mmap 로드용)로 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", type=str, default=None, help="저장 경로 (기본: CATALOGUE_SNAPSHOT_DIR)")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        # 스냅샷은 카탈로그 버전으로 유효성을 확인하므로 버전이 없으면 새로 발급
+        version = cache.get(INDEX_VERSION_KEY)
+        if version is None:
+            bump_index_version()
+            version = cache.get(INDEX_VERSION_KEY)
+
+        matrix = CatalogueMatrix.build(version)
+        manifest = save_catalogue_snapshot(*matrix.to_snapshot(), directory=options["dir"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"카탈로그 스냅샷 저장 완료. 게임 {manifest['count']}개, 이름 {len(manifest['vocabulary'])}개 "
+            f"({manifest['snapshot_id']}, {time.perf_counter() - started:.1f}초)"
+        ))
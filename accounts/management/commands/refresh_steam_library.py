@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import Account
+from accounts.steam_api import SteamAPIError
+from accounts.steam_library import LIBRARY_TTL, sync_steam_library
+
+
+class Command(BaseCommand):
+    help = "스팀 연동 유저의 보유 게임 목록(SteamLibrary)을 갱신합니다. (기본: 오래된 목록만)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="동기화 시간과 상관없이 전체 갱신")
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.exclude(steamId="")
+        if not options["all"]:
+            accounts = accounts.filter(
+                Q(steam_library__isnull=True)
+                | Q(steam_library__synced_at__lt=timezone.now() - LIBRARY_TTL)
+            )
+
+        count = failed = 0
+        for account in accounts.iterator():
+            try:
+                sync_steam_library(account)
+                count += 1
+            except SteamAPIError as e:
+                failed += 1
+                self.stderr.write(f"{account.id}번 유저 보유 게임 갱신 실패: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"보유 게임 목록 {count}개 갱신 완료. (실패 {failed}개)"))
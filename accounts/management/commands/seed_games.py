@@ -1,7 +1,67 @@
+import ast
 import csv
+import hashlib
+import json
+import time
+from functools import lru_cache
+
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
+from django.db import transaction
+
 from accounts.models import Game, Tag  # Game 모델 임포트
-import ast
+from accounts.tag_index import rebuild_game_tag_index
+
+
+# 한 번에 저장할 행 수
+BATCH_SIZE = 2000
+
+# CSV 컬럼 순서 (체크섬 계산용)
+CSV_COLUMNS = (
+    "appID", "name", "release_date", "required_age", "price", "header_image",
+    "windows", "mac", "linux", "metacritic_score", "metacritic_url",
+    "supported_languages", "categories", "genres", "screenshots", "movies",
+    "estimated_owners", "median_playtime_forever", "tags",
+)
+
+UPDATE_FIELDS = [
+    "name", "release_date", "required_age", "price", "header_image",
+    "windows", "mac", "linux", "metacritic_score", "metacritic_url",
+    "supported_languages", "categories", "genres", "genres_kr", "screenshots",
+    "movies", "estimated_owners", "median_playtime_forever", "tags", "row_checksum",
+]
+
+
+def parse_literal(value, default):
+    """
+    리스트/딕셔너리 문자열 파싱 (eval 대신)
+    JSON 형식이면 json.loads, 파이썬 리터럴(작은따옴표 등)이면 ast.literal_eval
+    """
+    if not value:
+        return default
+    try:
+        return json.loads(value)
+    except ValueError:
+        return ast.literal_eval(value)
+
+
+# 장르/카테고리/지원 언어는 같은 값이 반복되므로 파싱 결과 재사용 (결과는 수정하지 않음)
+parse_repeated_literal = lru_cache(maxsize=8192)(parse_literal)
+
+
+def to_int(value):
+    return int(value) if value != "" else 0
+
+
+def to_float(value):
+    return float(value) if value != "" else 0.0
+
+
+def row_checksum(row, genres_korean):
+    source = "\x1f".join(row.get(column, "") for column in CSV_COLUMNS)
+    source += "\x1f" + "\x1e".join(genres_korean)
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
 
 class Command(BaseCommand):
     help = "이 커맨드를 통해 CSV 파일의 데이터를 Game 모델에 적재합니다."
@@ -9,49 +69,85 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         # CSV 파일 경로를 받아오는 인자 추가
         parser.add_argument("file_path", type=str, help="CSV 파일의 경로")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="한 번에 저장할 행 수")
+        parser.add_argument(
+            "--checksum", action="store_true",
+            help="이전 적재 때와 내용이 같은 행(row_checksum 일치)은 건너뜀",
+        )
 
     def handle(self, *args, **options):
         file_path = options["file_path"]  # CSV 파일 경로 가져오기
+        batch_size = options["batch_size"]
+        started = time.perf_counter()
 
         try:
             # accounts_tag 데이터를 한 번만 조회하여 dict로 저장
             tags_dict = {tag.name_en: tag.name_ko for tag in Tag.objects.all()}
 
-            with open(file_path, "r", encoding="utf-8") as csv_file:
+            # 기존 행 체크섬 (변경 없는 행 건너뛰기용)
+            checksums = {}
+            if options["checksum"]:
+                checksums = dict(Game.objects.values_list("appID", "row_checksum"))
+
+            read = written = skipped = 0
+            batch = {}
+            with open(file_path, "r", encoding="utf-8", newline="") as csv_file:
                 reader = csv.DictReader(csv_file)
                 for row in reader:
+                    read += 1
+                    app_id = int(row["appID"])
+
                     # genres를 한글로 매핑
-                    genres_english = eval(row["genres"])  # 문자열 -> 리스트 변환
+                    genres_english = parse_repeated_literal(row["genres"], ())
                     genres_korean = [
                         tags_dict.get(genre, genre) for genre in genres_english
                     ]
 
-                    # 데이터를 Game 모델에 저장
-                    Game.objects.update_or_create(
-                        appID=int(row['appID']),  # lookup field
-                        defaults={  # 업데이트할 필드들
-                            'name': row['name'],
-                            'release_date': row['release_date'],
-                            'required_age': int(row['required_age']) if row['required_age'] != '' else 0,
-                            'price': float(row['price']) if row['price'] != '' else 0.0,
-                            'header_image': row['header_image'],
-                            'windows': row['windows'].lower() == 'true',
-                            'mac': row['mac'].lower() == 'true',
-                            'linux': row['linux'].lower() == 'true',
-                            'metacritic_score': int(row['metacritic_score']) if row['metacritic_score'] != '' else 0,
-                            'metacritic_url': row['metacritic_url'],
-                            'supported_languages': eval(row["supported_languages"]),
-                            'categories': eval(row['categories']) if row['categories'] else [],
-                            'genres': ast.literal_eval(row["genres"]),
-                            'genres_kr': genres_korean,
-                            'screenshots': eval(row['screenshots']) if row['screenshots'] else [],
-                            'movies': eval(row['movies']) if row['movies'] else [],
-                            'estimated_owners': row['estimated_owners'],
-                            'median_playtime_forever': int(row['median_playtime_forever']) if row['median_playtime_forever'] != '' else 0,
-                            'tags': eval(row['tags']) if row['tags'] else {}
-                        }
+                    checksum = row_checksum(row, genres_korean)
+                    if checksums.get(app_id) == checksum:
+                        skipped += 1
+                        continue
+
+                    # 같은 appID가 여러 번 나오면 마지막 행 사용 (update_or_create와 같은 결과)
+                    batch[app_id] = Game(
+                        appID=app_id,
+                        name=row["name"],
+                        release_date=row["release_date"],
+                        required_age=to_int(row["required_age"]),
+                        price=to_float(row["price"]),
+                        header_image=row["header_image"],
+                        windows=row["windows"].lower() == "true",
+                        mac=row["mac"].lower() == "true",
+                        linux=row["linux"].lower() == "true",
+                        metacritic_score=to_int(row["metacritic_score"]),
+                        metacritic_url=row["metacritic_url"],
+                        supported_languages=list(parse_repeated_literal(row["supported_languages"], ())),
+                        categories=list(parse_repeated_literal(row["categories"], ())),
+                        genres=list(genres_english),
+                        genres_kr=genres_korean,
+                        screenshots=parse_literal(row["screenshots"], []),
+                        movies=parse_literal(row["movies"], []),
+                        estimated_owners=row["estimated_owners"],
+                        median_playtime_forever=to_int(row["median_playtime_forever"]),
+                        tags=parse_literal(row["tags"], {}),
+                        row_checksum=checksum,
                     )
-            
+
+                    if len(batch) >= batch_size:
+                        written += self.save(batch)
+                        batch = {}
+                        self.report(read, written, skipped, started)
+
+                if batch:
+                    written += self.save(batch)
+
+            # 게임 태그 인덱스, 추천용 카탈로그 스냅샷, 리뷰의 게임 정보 갱신 (바뀐 게임이 있을 때만)
+            if written:
+                rebuild_game_tag_index()
+                call_command("export_catalogue", stdout=self.stdout)
+                call_command("backfill_review_games", all=True, stdout=self.stdout)
+
+            self.report(read, written, skipped, started)
             self.stdout.write(
                 self.style.SUCCESS("CSV 데이터를 성공적으로 적재했습니다.")
             )
@@ -59,4 +155,21 @@ class Command(BaseCommand):
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f"파일을 찾을 수 없습니다: {file_path}"))
         except Exception as e:
-            self.stderr.write(self.style.ERROR(f"오류 발생: {str(e)}"))
\ No newline at end of file
+            self.stderr.write(self.style.ERROR(f"오류 발생: {str(e)}"))
+
+    def save(self, batch):
+        with transaction.atomic():
+            Game.objects.bulk_create(
+                list(batch.values()),
+                update_conflicts=True,
+                unique_fields=["appID"],
+                update_fields=UPDATE_FIELDS,
+            )
+        return len(batch)
+
+    def report(self, read, written, skipped, started):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{read}행 읽음 (저장 {written}, 변경 없음 {skipped}) | "
+            f"{elapsed:.1f}초, {read / elapsed if elapsed else 0:.0f}행/초"
+        )
@@ -1,260 +1,186 @@
-import environ
-import requests
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
 from django.core.management.base import BaseCommand
 from django.db import transaction
-import re
-from bs4 import BeautifulSoup
+from django.db.models import Q
+from django.utils import timezone
+
 from accounts.models import (
     Account,
     SteamProfile,
     SteamReview,
     SteamPlaytime,
 )
+from accounts.recommend import invalidate_recommendations
+from accounts.steam_api import SteamAPIError
+from accounts.steam_library import fetch_owned_games, save_steam_library
+from accounts.steam_resolver import resolve_visibility
+from accounts.steam_service import fetch_top3_reviews
+from accounts.tag_profile import mark_tag_profiles_stale
 
 
-class Command(BaseCommand):
-    help = "Steam 프로필/리뷰/플레이타임 정보를 가져와 DB에 반영"
-
-    def handle(self, *args, **options):
-        # 1) 환경 변수에서 API 키 불러오기
-        env = environ.Env()
-        api_key = env("STEAM_API_KEY")  # .env에 STEAM_API_KEY=... 설정
-
-        # 2) steamId가 비어있지 않은 Account를 모두 가져온다
-        accounts = Account.objects.exclude(steamId="")
-        
-        # 3) 각 Account에 대해 프로필/리뷰/플레이타임 업데이트
-        for account in accounts:
-            steam_id_str = account.steamId.strip()
-
-            # 4) 전체 프로필 공개 여부 API로 확인
-            visibility_public = self.check_profile_public(api_key, steam_id_str)
-
-            # 기본값 False로 시작
-            is_review = False
-            is_playtime = False
-
-            if visibility_public:
-                # (A) 게임 목록 공개 여부 판단 (참고용)
-                owned_games_public = self.check_owned_games_public(api_key, steam_id_str)
-                
-
-                # (B) 리뷰 크롤링 (최대 3개) - BeautifulSoup 이용
-                review_data = self.fetch_top3_reviews(steam_id_str)
-                if review_data:
-                    is_review = True  # 한 개라도 있으면 True
-
-
-                # (C) 플레이타임 API로 가져오기 (상위 2개)
-                playtime_data = self.fetch_top2_playtime_api(api_key, steam_id_str)
-                if playtime_data:
-                    is_playtime = True
-                
-
-                # (D) DB 저장
-                with transaction.atomic():
-                    # SteamProfile
-                    sp, _ = SteamProfile.objects.get_or_create(account=account)
-                    sp.is_review = is_review
-                    sp.is_playtime = is_playtime
-                    sp.save()
-
-                    # 기존 리뷰/플레이타임 삭제 후 재생성 (중복 방지)
-                    SteamReview.objects.filter(account=account).delete()
-                    SteamPlaytime.objects.filter(account=account).delete()
-
-                    if is_review:
-                        for rd in review_data:
-                            SteamReview.objects.create(
-                                account=account,
-                                app_id=rd["app_id"]
-                                # review_text=rd["review_text"] 등 리뷰 내용 필요하면 추가
-                            )
-                    if is_playtime:
-                        for pd in playtime_data:
-                            SteamPlaytime.objects.create(
-                            account=account,
-                            app_id=pd["app_id"],
-                            )
-            else:
-                # 프로필 자체가 Private -> is_review=False, is_playtime=False
-                with transaction.atomic():
-                    sp, _ = SteamProfile.objects.get_or_create(account=account)
-                    sp.is_review = False
-                    sp.is_playtime = False
-                    sp.save()
-
-                    # 관련 리뷰/플레이타임 전부 삭제 (혹시 이전에 있으면)
-                    SteamReview.objects.filter(account=account).delete()
-                    SteamPlaytime.objects.filter(account=account).delete()
-
-        self.stdout.write(self.style.SUCCESS("Steam 데이터 처리 완료."))
-
-    # -------------------------------------------------------
-    # (A) 스팀 프로필이 Public인지 판별 (communityvisibilitystate)
-    # -------------------------------------------------------
-    def check_profile_public(self, api_key, steam_id_str):
-        # steam_id_str이 64비트 숫자인지 커스텀 url인지 확인
-        # GetPlayerSummaries는 64비트 SteamID만 받으므로
-        # 커스텀 url -> 변환 단계가 필요할 수도 있다.
-        # 여기서는 간단히 "커스텀 URL은 communityvisibilitystate 판단 불가"라고 가정하거나,
-        # vanity URL -> steamid64 변환 API(ResolveVanityURL)를 사용 가능.
-        #
-        # 예시: https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/
-        #       ?key=XXXX&vanityurl=커스텀URL
-        #       -> response: { "response": { "success": 1, "steamid": "7656119..." } }
-        #
-        # 여기서는 단순히 숫자 판별로만 진행. 테스트는 아직 못함
-        steamid64 = None
-        if steam_id_str.isdigit():
-            steamid64 = steam_id_str
-        else:
-            # 커스텀 URL -> ResolveVanityURL API로 변환 시도 (간단 버전)
-            steamid64 = self.resolve_vanity_url(api_key, steam_id_str)
-
-            if not steamid64:
-                # Vanity URL도 해결 안 된다면, 그냥 False 처리 ㅜ
-                return False
+# DB 반영 단위 (유저 수)
+SAVE_BATCH_SIZE = 500
 
-        # communityvisibilitystate 확인
-        url = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/"
-        params = {"key": api_key, "steamids": steamid64}
-        resp = requests.get(url, params=params).json()
-        players = resp.get("response", {}).get("players", [])
-        if not players:
-            return False
 
-        player = players[0]
-        vis_state = player.get("communityvisibilitystate", 1)
-        return (vis_state == 3)
+class Command(BaseCommand):
+    help = "Steam 프로필/리뷰/플레이타임 정보를 가져와 DB에 반영"
 
-    # -------------------------------------------------------
-    # (B) 게임 목록(owned games) 공개 여부 확인
-    # -------------------------------------------------------
-    def check_owned_games_public(self, api_key, steam_id_str):
-        # 마찬가지로 steam_id_str -> steamid64 변환
-        steamid64 = steam_id_str if steam_id_str.isdigit() else self.resolve_vanity_url(api_key, steam_id_str)
-        if not steamid64:
-            return False
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="유저별 조회 동시 실행 수")
+        parser.add_argument(
+            "--since-hours", type=int, default=24,
+            help="이 시간 안에 동기화된 유저는 건너뜀",
+        )
+        parser.add_argument("--force", action="store_true", help="최근 동기화 여부와 상관없이 전체 동기화")
 
-        url = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
-        params = {"key": api_key, "steamid": steamid64}
-        resp = requests.get(url, params=params).json()
-        # Game details가 비공개면 "response": {} 이거나 games 없음
-        games = resp.get("response", {}).get("games", [])
-        # games가 있다면 True로 볼 수 있음
-        return len(games) > 0
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        # 1) 동기화 대상 유저 (최근에 동기화된 유저 제외)
+        linked = Account.objects.exclude(steamId="")
+        accounts = linked
+        if not options["force"]:
+            since = timezone.now() - timedelta(hours=options["since_hours"])
+            accounts = accounts.exclude(steamprofile__synced_at__gte=since)
+        accounts = list(accounts.only("id", "steamId"))
+        skipped = linked.count() - len(accounts)
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            # 2) steamid64 확인(커스텀 URL 변환) + 전체 프로필 공개 여부 (100명씩 묶어서 조회)
+            visibility, unresolved, summary_calls = resolve_visibility(accounts, executor)
+
+            # 확인하지 못한 유저(변환/조회 실패)는 저장된 데이터를 그대로 두고 다음 실행 때 다시 시도
+            if unresolved:
+                self.stderr.write(
+                    f"steamid/프로필 공개 여부 확인 실패 {len(unresolved)}명 (다음 실행 때 다시 시도): "
+                    f"{sorted(unresolved)}"
+                )
+            accounts = [account for account in accounts if account.id not in unresolved]
+
+            # 3) 공개 프로필만 리뷰 크롤링 / 보유 게임 조회
+            futures = {
+                executor.submit(self.fetch_user_data, visibility[account.id][0]): account
+                for account in accounts
+                if visibility[account.id][1]
+            }
+            results = {}
+            failed = 0
+            for future in as_completed(futures):
+                account = futures[future]
+                try:
+                    results[account.id] = future.result()
+                except SteamAPIError as e:
+                    failed += 1
+                    self.stderr.write(f"{account.id}번 유저 스팀 정보 조회 실패: {e}")
+
+        # 4) DB 반영 (조회에 실패한 유저는 다음 실행 때 다시 시도)
+        targets = [
+            account for account in accounts
+            if account.id in results or not visibility[account.id][1]
+        ]
+        for i in range(0, len(targets), SAVE_BATCH_SIZE):
+            self.save(targets[i:i + SAVE_BATCH_SIZE], results)
+
+        elapsed = time.perf_counter() - started
+        processed = len(targets)
+        self.stdout.write(self.style.SUCCESS(
+            f"Steam 데이터 처리 완료. {processed}명 동기화 "
+            f"(공개 {len(results)}, 비공개 {processed - len(results)}, 실패 {failed + len(unresolved)}, "
+            f"건너뜀 {skipped}) | "
+            f"{elapsed:.1f}초, {processed / elapsed if elapsed else 0:.1f}명/초 | "
+            f"GetPlayerSummaries {summary_calls}회"
+        ))
 
     # -------------------------------------------------------
-    # (C) 리뷰 페이지 크롤링 (상위 3개 'Recommended') - BeautifulSoup 사용
+    # 유저별 리뷰(상위 3개 'Recommended') / 보유 게임 조회 - 워커 스레드에서 실행
     # -------------------------------------------------------
-    def fetch_top3_reviews(self, steam_id_str):
-        base_url = "https://steamcommunity.com/"
-        # 프로필 주소 결정
-        if steam_id_str.isdigit():
-            url = f"{base_url}profiles/{steam_id_str}/recommended"
-        else:
-            url = f"{base_url}id/{steam_id_str}/recommended"
-
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/87.0.4280.66 Safari/537.36"
-            )
+    def fetch_user_data(self, steam_id):
+        games, game_count = fetch_owned_games(steam_id)
+        return {
+            "steam_id": steam_id,
+            "reviews": [rd["app_id"] for rd in fetch_top3_reviews(steam_id)],
+            "games": games,
+            "game_count": game_count,
         }
 
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code != 200:
-                # 프로필이 Private 상태거나 접근 실패 시 빈 리스트
-                return []
-            soup = BeautifulSoup(response.text, "html.parser")
-        except:
-            # 요청 실패 시 빈 리스트
-            return []
-
-        boxes = soup.select(".review_box")
-        recommended = []
-        for box in boxes:
-            try:
-                title_elem = box.select_one(".vote_header .title > a")
-                if title_elem and "Recommended" in title_elem.text:
-                    href = title_elem.get("href", "")
-                    if "/recommended/" in href:
-                        app_id = href.split("/recommended/")[1].split("/")[0]
-                        recommended.append({"app_id": app_id})
-                        if len(recommended) >= 3:
-                            break
-            except:
-                # 파싱 실패 시 다음 리뷰로 넘어감
-                continue
-
-        return recommended
-
     # -------------------------------------------------------
-    # (D) 플레이 타임 크롤링 (상위 2개) / 최근 플레이 게임을 기준으로 추출하려 했는데
-    # 로그인이 필요해서 그냥 API로 가져오도록 함(비공개 여부 파악 힘듬)
+    # DB 반영 - 기존 행 삭제/재생성 대신 upsert 후 빠진 행만 삭제
     # -------------------------------------------------------
+    def save(self, accounts, results):
+        account_ids = [account.id for account in accounts]
+        now = timezone.now()
 
-    def fetch_top2_playtime_api(self, api_key, steam_id_str):
-    
-        # steam_id_str(64비트 숫자)에 대해 GetOwnedGames API를 호출해,
-        # playtime_forever 기준으로 상위 2개 app_id를 리턴한다.
-        # return 형식: [{"app_id": 233860, "playtime": 304.55}, ...]
-    
-        # 1) SteamID64 확인
-        # 커스텀 URL이면, self.resolve_vanity_url(api_key, steam_id_str)로 변환
-        if not steam_id_str.isdigit():
-            steam_id_str = self.resolve_vanity_url(api_key, steam_id_str)
-            if not steam_id_str:
-                return []
-
-        # 2) API 호출
-        url = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
-        params = {
-            "key": api_key,
-            "steamid": steam_id_str,
-            #"include_appinfo": True,           # 게임 이름 등 추가 정보
-            #"include_played_free_games": True  # Free to play 게임도 포함할지 여부
+        old_profiles = {
+            sp.account_id: (sp.is_review, sp.is_playtime)
+            for sp in SteamProfile.objects.filter(account_id__in=account_ids)
         }
-        try:
-            resp = requests.get(url, params=params).json()
-        except Exception as e:
-            print("Error fetching owned games:", e)
-            return []
-
-        # 3) 응답 파싱
-        games = resp.get("response", {}).get("games", [])
-        if not games:
-            # 게임이 하나도 없거나 비공개인 경우
-            return []
-
-        # 4) playtime_forever (분) → 시간 단위로 변환, 내림차순 정렬
-        game_data = []
-        for g in games:
-            app_id = g.get("appid")
-            pt_min = g.get("playtime_forever", 0)  # 분 단위
-            pt_hr = round(pt_min / 60.0, 2)        # 시간 단위 (소수점 2자리 예시)
-            game_data.append({"app_id": str(app_id), "playtime": pt_hr})
-
-        # 5) 플레이 타임 내림차순 정렬 후 상위 2개
-        sorted_data = sorted(game_data, key=lambda x: x["playtime"], reverse=True)
-        top2 = sorted_data[:2]
-        return top2
-
-
-    # -------------------------------------------------------
-    # (E) 커스텀 URL -> 64비트 steamid 변환 (ResolveVanityURL)
-    # 테스트는 아직 못함..
-    # -------------------------------------------------------
-
-    def resolve_vanity_url(self, api_key, vanity_str):
-        url = "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/"
-        params = {"key": api_key, "vanityurl": vanity_str}
-        resp = requests.get(url, params=params).json()
-        success = resp.get("response", {}).get("success", 42)
-        if success == 1:
-            return resp["response"]["steamid"]  # 64비트 ID
-        else:
-            return None
+        old_reviews = defaultdict(set)
+        for account_id, app_id in SteamReview.objects.filter(account_id__in=account_ids).values_list("account_id", "app_id"):
+            old_reviews[account_id].add(app_id)
+        old_playtimes = defaultdict(set)
+        for account_id, app_id in SteamPlaytime.objects.filter(account_id__in=account_ids).values_list("account_id", "app_id"):
+            old_playtimes[account_id].add(app_id)
+
+        profiles, reviews, playtimes = [], [], []
+        keep_reviews, keep_playtimes = Q(), Q()
+        changed = []
+        for account in accounts:
+            data = results.get(account.id)
+            review_ids = data["reviews"] if data else []
+            # 플레이 타임 상위 2개 (분 -> 시간)
+            top2 = [
+                (str(g["appid"]), round(g.get("playtime_forever", 0) / 60.0, 2))
+                for g in (data["games"][:2] if data else [])
+            ]
+
+            profiles.append(SteamProfile(
+                account_id=account.id,
+                is_review=bool(review_ids),
+                is_playtime=bool(top2),
+                synced_at=now,
+            ))
+            reviews.extend(SteamReview(account_id=account.id, app_id=app_id) for app_id in review_ids)
+            playtimes.extend(
+                SteamPlaytime(account_id=account.id, app_id=app_id, playtime=playtime)
+                for app_id, playtime in top2
+            )
+            keep_reviews |= Q(account_id=account.id, app_id__in=review_ids)
+            keep_playtimes |= Q(account_id=account.id, app_id__in=[app_id for app_id, _ in top2])
+
+            if (
+                old_profiles.get(account.id) != (bool(review_ids), bool(top2))
+                or old_reviews[account.id] != set(review_ids)
+                or old_playtimes[account.id] != {app_id for app_id, _ in top2}
+            ):
+                changed.append(account.id)
+
+        with transaction.atomic():
+            SteamProfile.objects.bulk_create(
+                profiles,
+                update_conflicts=True,
+                unique_fields=["account"],
+                update_fields=["is_review", "is_playtime", "synced_at"],
+            )
+            SteamReview.objects.filter(account_id__in=account_ids).exclude(keep_reviews).delete()
+            SteamReview.objects.bulk_create(reviews, ignore_conflicts=True)
+            SteamPlaytime.objects.filter(account_id__in=account_ids).exclude(keep_playtimes).delete()
+            SteamPlaytime.objects.bulk_create(
+                playtimes,
+                update_conflicts=True,
+                unique_fields=["account", "app_id"],
+                update_fields=["playtime"],
+            )
+            for account in accounts:
+                data = results.get(account.id)
+                if data:
+                    save_steam_library(account, data["steam_id"], data["games"], data["game_count"])
+
+            # bulk_create는 post_save 신호가 없으므로 바뀐 유저만 직접 갱신
+            if changed:
+                transaction.on_commit(lambda: mark_tag_profiles_stale(changed))
+            for account_id in changed:
+                invalidate_recommendations(account_id)
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from accounts.steam_sync import claim_jobs, release_stale_jobs, run_job
+from accounts.tag_profile import refresh_stale_tag_profiles
+
+
+class Command(BaseCommand):
+    help = "스팀 연동 동기화 작업(SteamSyncJob)과 유저 태그 프로필 갱신을 처리합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=10, help="한 번에 가져올 작업 수")
+        parser.add_argument("--interval", type=float, default=2.0, help="작업이 없을 때 대기 시간(초)")
+        parser.add_argument("--once", action="store_true", help="대기 중인 작업만 처리하고 종료")
+
+    def handle(self, *args, **options):
+        self.stdout.write("스팀 동기화 워커 시작 (동기화 작업, 유저 태그 프로필 갱신)")
+        done = failed = 0
+        while True:
+            close_old_connections()
+            released = release_stale_jobs()
+            if released:
+                self.stdout.write(f"중단된 작업 {released}개 다시 대기 상태로 변경")
+
+            jobs = claim_jobs(options["batch"])
+            for job in jobs:
+                if run_job(job):
+                    done += 1
+                else:
+                    failed += 1
+
+            # 관심사/스팀 데이터가 바뀐 유저의 태그 프로필 다시 계산
+            profiles = refresh_stale_tag_profiles()
+
+            if jobs:
+                self.stdout.write(f"작업 {len(jobs)}개 처리 (누적 성공 {done}, 실패 {failed})")
+            if profiles:
+                self.stdout.write(f"유저 태그 프로필 {profiles}개 갱신")
+            if jobs or profiles:
+                continue
+            if options["once"]:
+                break
+            else:
+                time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"스팀 동기화 완료. (성공 {done}, 실패 {failed})"))
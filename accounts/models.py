@@ -1,11 +1,12 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from accounts.utils import OverwriteStorage, rename_imagefile_to_uid
 from django.conf import settings
 from django.db.models import Q
-import requests
+from django.utils import timezone
 import json
-import environ
 
 
 class Game(models.Model):
@@ -30,10 +31,35 @@ class Game(models.Model):
     estimated_owners = models.CharField(max_length=100)
     median_playtime_forever = models.IntegerField(default=0)
     tags = models.JSONField(default=dict)
+    row_checksum = models.CharField(max_length=40, blank=True)  # seed_games 적재 당시 CSV 행 해시
 
     def __str__(self):
         return self.name
 
+class GameTagIndex(models.Model):
+    """
+    게임 app_id -> 인기 태그(steam_tag_id) 순서 목록 인덱스
+    Game.tags(데이터셋)로 만들고, 데이터셋에 없는 게임만 상점 페이지에서 가져와 추가한다
+    """
+
+    SOURCE_DATASET = "dataset"
+    SOURCE_STORE = "store"
+
+    SOURCE_CHOICES = [
+        (SOURCE_DATASET, "데이터셋"),
+        (SOURCE_STORE, "스팀 상점"),
+    ]
+
+    app_id = models.IntegerField(unique=True)  # Steam App ID
+    tag_ids = ArrayField(
+        models.IntegerField(), default=list, blank=True
+    )  # 인기순으로 정렬된 steam_tag_id
+    source = models.CharField(
+        max_length=10, choices=SOURCE_CHOICES, default=SOURCE_DATASET
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+
 class Tag(models.Model):  # 게임의 태그
     name_en = models.CharField(max_length=50, unique=True)
     name_ko = models.CharField(max_length=20, unique=True)
@@ -149,47 +175,40 @@ class Account(AbstractBaseUser):
             steam_tag_id__in=steam_tag_ids
         ).values_list('name_en', flat=True).distinct())
 
-    def get_top_played_games_tags(self):
+    def get_top_played_games_tags(self, owned_games=None):
         """
         스팀 연동된 계정의 플레이타임 상위 5개 게임의 태그를 반환
+        owned_games: 이미 조회한 보유 게임 목록 (없으면 저장된 SteamLibrary에서 조회)
         """
+        from accounts.steam_library import get_owned_games
+
         if not self.steamId:
             return []
 
         try:
-            env = environ.Env()
-            api_key = env("STEAM_API_KEY")
-            api_url = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
-            params = {
-                "key": api_key,
-                "steamid": self.steamId,
-                "include_appinfo": True,
-            }
-            response = requests.get(api_url, params=params)
+            if owned_games is None:
+                owned_games = get_owned_games(self)
+            # 플레이타임으로 정렬하여 상위 5개 게임 추출
+            top_games = sorted(
+                owned_games,
+                key=lambda x: x["playtime_forever"],
+                reverse=True
+            )[:5]
+            
+            # 상위 5개 게임의 appID 목록
+            top_game_ids = [game["appid"] for game in top_games]
+            
+            # DB에서 해당 게임들의 태그 조회
+            games_with_tags = Game.objects.filter(appID__in=top_game_ids)
+            
+            # 모든 태그를 하나의 리스트로 합침
+            all_tags = []
+            for game in games_with_tags:
+                tags = json.loads(game.tags) if isinstance(game.tags, str) else game.tags
+                all_tags.extend(tags)
+            
+            return all_tags
             
-            if response.status_code == 200:
-                response_data = response.json()["response"]
-                # 플레이타임으로 정렬하여 상위 5개 게임 추출
-                top_games = sorted(
-                    response_data.get("games", []),
-                    key=lambda x: x["playtime_forever"],
-                    reverse=True
-                )[:5]
-                
-                # 상위 5개 게임의 appID 목록
-                top_game_ids = [game["appid"] for game in top_games]
-                
-                # DB에서 해당 게임들의 태그 조회
-                games_with_tags = Game.objects.filter(appID__in=top_game_ids)
-                
-                # 모든 태그를 하나의 리스트로 합침
-                all_tags = []
-                for game in games_with_tags:
-                    tags = json.loads(game.tags) if isinstance(game.tags, str) else game.tags
-                    all_tags.extend(tags)
-                
-                return all_tags
-                
         except Exception as e:
             print(f"스팀 게임 태그 조회 실패: {e}")
             return []
@@ -246,6 +265,7 @@ class SteamProfile(models.Model):
     account = models.OneToOneField(Account, on_delete=models.CASCADE)
     is_review = models.BooleanField(default=False)  # 리뷰 공개 여부
     is_playtime = models.BooleanField(default=False)  # 플레이 타임 공개 여부
+    synced_at = models.DateTimeField(null=True, blank=True)  # steam_data 마지막 동기화 시간
 
 
 class SteamReview(models.Model):
@@ -257,6 +277,13 @@ class SteamReview(models.Model):
     app_id = models.CharField(max_length=50)  # 게임 앱 아이디
     # review_text = models.TextField(blank=True)  # 필요 시 리뷰 내용을 저장
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "app_id"], name="unique_steam_review"
+            )
+        ]
+
 
 class SteamPlaytime(models.Model):
     """
@@ -265,6 +292,79 @@ class SteamPlaytime(models.Model):
 
     account = models.ForeignKey(Account, on_delete=models.CASCADE)
     app_id = models.CharField(max_length=50)
+    playtime = models.FloatField(default=0)  # 총 플레이 시간 (시간 단위)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "app_id"], name="unique_steam_playtime"
+            )
+        ]
+
+
+class SteamSyncJob(models.Model):
+    """
+    스팀 연동 후 프로필/리뷰/플레이타임/보유 게임 동기화 작업
+    steam_sync_worker 커맨드가 pending 작업을 가져가서 처리한다
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "대기"),
+        (RUNNING, "진행 중"),
+        (DONE, "완료"),
+        (FAILED, "실패"),
+    ]
+
+    account = models.ForeignKey(
+        Account, on_delete=models.CASCADE, related_name="steam_sync_jobs"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.IntegerField(default=0)  # 실행 횟수
+    error = models.TextField(blank=True)  # 마지막 실패 사유
+    next_attempt_at = models.DateTimeField(default=timezone.now)  # 이 시간 이후에 실행 (실패 시 재시도 대기)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+        constraints = [
+            # 유저 당 대기 중인 작업은 하나만
+            models.UniqueConstraint(
+                fields=["account"],
+                condition=Q(status="pending"),
+                name="unique_pending_steam_sync",
+            )
+        ]
+
+
+class SteamVanity(models.Model):
+    """
+    스팀 커스텀 URL(vanity) -> 64비트 steamid 변환 결과
+    ResolveVanityURL을 동기화마다 다시 호출하지 않도록 저장한다
+    """
+
+    vanity_url = models.CharField(max_length=100, unique=True)
+    steam_id = models.CharField(max_length=30)
+    resolved_at = models.DateTimeField(auto_now=True)
+
+
+class SteamLibrary(models.Model):
+    """
+    스팀 연동 유저의 전체 보유 게임 목록 (플레이 타임 포함)
+    프로필/추천 화면마다 GetOwnedGames를 호출하지 않도록 저장해두고 백그라운드에서 갱신한다
+    """
+
+    account = models.OneToOneField(
+        Account, on_delete=models.CASCADE, related_name="steam_library"
+    )
+    steam_id = models.CharField(max_length=30)  # 동기화 당시 steamId (변경 감지용)
+    games = models.JSONField(default=list)  # GetOwnedGames 응답 games (플레이 타임 내림차순)
+    game_count = models.IntegerField(default=0)
+    synced_at = models.DateTimeField(db_index=True)  # 마지막 동기화 시간
 
 
 class Block(models.Model):
@@ -288,3 +388,28 @@ class Block(models.Model):
     class Meta:
         unique_together = [("blocker", "blocked_user")]
         ordering = ["-created_at"]
+
+
+class UserTagProfile(models.Model):
+    """
+    유저 취향 태그 프로필 (관심사 + 스팀 리뷰/플레이타임 게임 태그)
+    챗봇 질의마다 스팀 상점 페이지를 크롤링하지 않도록 미리 계산해서 저장한다
+    AccountInterest, SteamReview, SteamPlaytime, SteamProfile 변경 시 signals에서 is_stale로 표시하고
+    steam_sync_worker(또는 build_tag_profiles --stale)가 다시 계산한다
+    """
+
+    account = models.OneToOneField(
+        Account, on_delete=models.CASCADE, related_name="tag_profile"
+    )
+    tag_groups = models.JSONField(default=list)  # 관심사/게임 별로 그룹화된 steam_tag_id 리스트
+    tag_ids = ArrayField(
+        models.IntegerField(), default=list, blank=True
+    )  # 평탄화된 steam_tag_id (유사 유저 검색용)
+    is_stale = models.BooleanField(default=False)  # 다시 계산해야 하는지
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["tag_ids"], name="tag_profile_tag_ids_gin"),
+            models.Index(fields=["is_stale", "updated_at"], name="tag_profile_stale_idx"),
+        ]
@@ -0,0 +1,444 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.core.cache import cache
+from django.db import close_old_connections
+from scipy import sparse
+
+from accounts.catalogue_snapshot import load_catalogue_snapshot
+from accounts.models import Account, Game
+from accounts.steam_library import get_owned_games
+from accounts.tag_index import INDEX_VERSION_KEY, OWNERS_RANGES
+
+
+# 소유자가 많은 게임으로 보는 구간 (플레이타임 기반 추천 후보 조건)
+POPULAR_OWNERS = {
+    "1000000 - 2000000",
+    "2000000 - 5000000",
+    "5000000 - 10000000",
+    "10000000 - 20000000",
+    "20000000 - 50000000",
+    "50000000 - 100000000",
+    "100000000 - 200000000",
+}
+
+# 유저별 추천 결과 캐시
+# 관심사, 스팀 데이터가 바뀌면 유저별 버전을 올려 이전 결과를 무효화
+RESULT_KEY = "recommend_result:{account_id}"
+USER_VERSION_KEY = "recommend_version:{account_id}"
+RESULT_TIMEOUT = 60 * 60 * 24 * 7
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="recommend-refresh")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# 추천 화면에 내려주는 게임 필드
+DISPLAY_FIELDS = (
+    "id", "appID", "name", "header_image", "price",
+    "required_age", "metacritic_score", "genres", "genres_kr",
+)
+
+
+def _terms(value):
+    """
+    tags(dict)/genres/categories(list) JSON 값을 소문자 이름 집합으로 변환
+    """
+    if isinstance(value, str):
+        value = json.loads(value) if value else []
+    return {term.lower() for term in value or []}
+
+
+class CatalogueMatrix:
+    """
+    추천 점수 계산용 게임 카탈로그 행렬 (프로세스 당 1개)
+    - 게임 x 이름(tag/genre/category 소문자) 희소 행렬 3개
+    - 나이 제한, 메타크리틱, 소유자 점수, 플레이타임 같은 숫자 열
+    사용자 태그를 벡터로 만들어 행렬 곱 한 번으로 모든 게임의 점수를 계산한다
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls):
+        """
+        현재 카탈로그 버전에 맞는 행렬 반환 (버전이 바뀌었으면 다시 생성)
+        같은 버전의 스냅샷 파일이 있으면 DB 대신 스냅샷에서 로드
+        """
+        version = cache.get(INDEX_VERSION_KEY)
+        instance = cls._instance
+        if instance is None or instance.version != version:
+            with cls._lock:
+                instance = cls._instance
+                if instance is None or instance.version != version:
+                    snapshot = load_catalogue_snapshot()
+                    if version is not None and snapshot and snapshot[0]["version"] == version:
+                        instance = cls.from_snapshot(snapshot)
+                    else:
+                        instance = cls.build(version)
+                    cls._instance = instance
+        return instance
+
+    @classmethod
+    def build(cls, version=None):
+        rows = (
+            Game.objects.filter(metacritic_score__isnull=False)
+            .order_by("id")
+            .values_list(
+                "appID", "required_age", "metacritic_score",
+                "median_playtime_forever", "estimated_owners",
+                "tags", "genres", "categories",
+            )
+            .iterator(chunk_size=5000)
+        )
+        return cls.from_rows(rows, version)
+
+    @classmethod
+    def from_rows(cls, rows, version=None):
+        """
+        (appID, required_age, metacritic_score, median_playtime_forever,
+         estimated_owners, tags, genres, categories) 행들로 행렬 생성
+        """
+        vocabulary = {}
+        columns = {"tags": ([], [0]), "genres": ([], [0]), "categories": ([], [0])}
+        app_ids, ages, metacritic, playtime, owner_codes = [], [], [], [], []
+        owner_labels = {}
+
+        for app_id, age, score, median_playtime, estimated_owners, tags, genres, categories in rows:
+            app_ids.append(app_id)
+            ages.append(age or 0)
+            metacritic.append(score or 0)
+            playtime.append(median_playtime or 0)
+            owner_codes.append(owner_labels.setdefault(estimated_owners, len(owner_labels)))
+            for name, value in (("tags", tags), ("genres", genres), ("categories", categories)):
+                indices, indptr = columns[name]
+                indices.extend(vocabulary.setdefault(term, len(vocabulary)) for term in _terms(value))
+                indptr.append(len(indices))
+
+        shape = (len(app_ids), max(len(vocabulary), 1))
+        matrices = {
+            name: sparse.csr_matrix(
+                (np.ones(len(indices), dtype=np.int32), np.array(indices, dtype=np.int32), np.array(indptr)),
+                shape=shape,
+            )
+            for name, (indices, indptr) in columns.items()
+        }
+        return cls(
+            vocabulary,
+            matrices,
+            np.array(app_ids, dtype=np.int64),
+            np.array(ages, dtype=np.int32),
+            np.array(metacritic, dtype=np.int32),
+            np.array(playtime, dtype=np.int32),
+            np.array(owner_codes, dtype=np.int16),
+            list(owner_labels),
+            version,
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        export_catalogue로 저장한 스냅샷(mmap 배열)으로 행렬 생성 - DB 조회/JSON 파싱 없음
+        """
+        manifest, columns = snapshot
+        vocabulary = {term: index for index, term in enumerate(manifest["vocabulary"])}
+        shape = (manifest["count"], max(len(vocabulary), 1))
+        matrices = {
+            name: sparse.csr_matrix(
+                (
+                    np.ones(len(columns[f"{name}_values"]), dtype=np.int32),
+                    columns[f"{name}_values"],
+                    columns[f"{name}_offsets"],
+                ),
+                shape=shape,
+                copy=False,
+            )
+            for name in ("tags", "genres", "categories")
+        }
+        return cls(
+            vocabulary,
+            matrices,
+            columns["app_ids"],
+            columns["ages"],
+            columns["metacritic"],
+            columns["playtime"],
+            columns["owners"],
+            manifest["owners"],
+            manifest["version"],
+        )
+
+    def to_snapshot(self):
+        """
+        스냅샷 저장용 (manifest, 열 이름 -> 배열)
+        """
+        manifest = {
+            "version": self.version,
+            "count": len(self),
+            "vocabulary": sorted(self.vocabulary, key=self.vocabulary.get),
+            "owners": self.owner_labels,
+        }
+        columns = {
+            "app_ids": self.app_ids,
+            "ages": self.ages,
+            "metacritic": self.metacritic,
+            "playtime": self.playtime,
+            "owners": self.owner_codes,
+        }
+        for name in ("tags", "genres", "categories"):
+            matrix = getattr(self, name)
+            columns[f"{name}_offsets"] = matrix.indptr
+            columns[f"{name}_values"] = matrix.indices
+        return manifest, columns
+
+    def __init__(self, vocabulary, matrices, app_ids, ages, metacritic, playtime, owner_codes, owner_labels, version=None):
+        self.vocabulary = vocabulary
+        self.tags = matrices["tags"]
+        self.genres = matrices["genres"]
+        self.categories = matrices["categories"]
+        self.app_ids = app_ids
+        self.ages = ages
+        self.metacritic = metacritic
+        self.playtime = playtime
+        self.owner_codes = owner_codes
+        self.owner_labels = owner_labels
+        self.version = version
+
+        # 소유자 수 구간(owner_labels의 번호)별 점수 / 인기 여부
+        owners_score = np.array(
+            [OWNERS_RANGES.get(o, 0) for o in owner_labels] or [0], dtype=np.int32
+        )[owner_codes]
+        popular = np.array([o in POPULAR_OWNERS for o in owner_labels] or [False], dtype=bool)[owner_codes]
+
+        # 사용자와 무관한 점수는 미리 계산
+        # 1) 관심사 기반: 플레이타임(최대 100) + 소유자 수 + 메타크리틱
+        self.interest_base = np.minimum(playtime // 10, 100) + owners_score + metacritic
+
+        # 2) 플레이타임 기반: 적정 플레이타임 보너스 + 소유자 수 + 메타크리틱
+        playtime_bonus = np.select(
+            [
+                (playtime >= 120) & (playtime <= 3000),  # 2시간 ~ 50시간
+                (playtime >= 60) & (playtime < 120),  # 1~2시간
+                (playtime > 3000) & (playtime <= 6000),  # 50~100시간
+            ],
+            [50, 25, 35],
+            default=10,
+        )
+        self.playtime_base = playtime_bonus + owners_score + metacritic
+
+        # 메타크리틱 75점 이상이거나 소유자가 많은 게임만 플레이타임 기반 후보
+        self.playtime_eligible = (metacritic >= 75) | popular
+
+    def __len__(self):
+        return len(self.app_ids)
+
+    def _query(self, terms):
+        vector = np.zeros(self.tags.shape[1], dtype=np.int32)
+        for term in terms:
+            index = self.vocabulary.get(term.lower())
+            if index is not None:
+                vector[index] = 1
+        return vector
+
+    def _match_score(self, terms, tag_weight, genre_weight, category_weight):
+        vector = self._query(terms)
+        return (
+            (self.tags @ vector) * tag_weight
+            + (self.genres @ vector) * genre_weight
+            + (self.categories @ vector) * category_weight
+        )
+
+    def _candidates(self, age, owned_app_ids):
+        mask = self.ages <= age
+        if owned_app_ids:
+            mask &= ~np.isin(self.app_ids, np.fromiter(owned_app_ids, dtype=np.int64))
+        return mask
+
+    def interest_scores(self, terms):
+        return self._match_score(terms, 50, 50, 30) + self.interest_base
+
+    def playtime_scores(self, terms):
+        return self._match_score(terms, 20, 20, 15) + self.playtime_base
+
+    @staticmethod
+    def top_k(scores, mask, k):
+        """
+        점수 상위 k개 (행 번호, 점수) 반환
+        동점이면 행 순서(Game.id)가 앞선 게임 우선 (heapq.nlargest와 같은 순서)
+        """
+        positions = np.flatnonzero(mask)
+        scores = scores[positions]
+        if len(positions) > k:
+            kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[: k - len(above)]
+            keep = np.concatenate([above, ties])
+            positions, scores = positions[keep], scores[keep]
+        order = np.lexsort((positions, -scores))
+        return positions[order], scores[order]
+
+    def recommend(self, interest_terms, played_terms, age, owned_app_ids=(), k=15):
+        """
+        관심사 기반, 플레이타임 기반 추천 결과 [(appID, 점수), ...] 2개 반환
+        """
+        mask = self._candidates(age, owned_app_ids)
+        results = []
+        for scores, candidates in (
+            (self.interest_scores(interest_terms), mask),
+            (self.playtime_scores(played_terms), mask & self.playtime_eligible),
+        ):
+            positions, top_scores = self.top_k(scores, candidates, k)
+            results.append([
+                (int(self.app_ids[p]), int(s)) for p, s in zip(positions, top_scores)
+            ])
+        return results
+
+
+def load_display_games(ranked):
+    """
+    [(appID, 점수), ...] 순서대로 화면 표시용 게임 정보 조회
+    """
+    games = {
+        game["appID"]: game
+        for game in Game.objects.filter(appID__in=[app_id for app_id, _ in ranked]).values(*DISPLAY_FIELDS)
+    }
+    result = []
+    for app_id, score in ranked:
+        game = games.get(app_id)
+        if game is None:
+            continue
+        game = dict(game)
+        if isinstance(game["genres"], str):
+            game["genres"] = json.loads(game["genres"])
+        game["score"] = score
+        result.append(game)
+    return result
+
+
+def compute_recommendations(user):
+    """
+    유저의 관심사 기반, 플레이타임 기반 추천 게임 목록 계산
+    """
+    print("\n=== 추천 게임 계산 시작 ===")
+    user_age = user.age
+    print(f"요청 유저: {user.nickname} (ID: {user.id})")
+
+    # 보유 게임 목록(SteamLibrary)은 한 번만 조회해서 플레이 태그 계산과 보유 게임 제외에 같이 사용
+    owned_games = []
+    if user.steamId:
+        print(f"\n=== 스팀 연동 정보 ===")
+        print(f"스팀 ID: {user.steamId}")
+        owned_games = get_owned_games(user)
+        print(f"=== 보유한 게임 목록 ===")
+        print(f"총 {len(owned_games)}개의 게임 보유")
+    owned_game_ids = {game["appid"] for game in owned_games}
+
+    # 기본 태그와 플레이한 게임 태그 분리
+    user_tags = set(tag.lower() for tag in user.get_steam_tag_names_en())
+    all_played_game_tags = set(
+        tag.lower() for tag in user.get_top_played_games_tags(owned_games=owned_games)
+    )
+
+    # played_game_tags를 user_tags와 같은 크기로 제한
+    played_game_tags = set(list(all_played_game_tags)[:len(user_tags)])
+
+    print("\n=== 유저 태그 정보 ===")
+    print(f"기본 태그 ({len(user_tags)}개):", user_tags)
+    print(f"플레이한 게임 태그 ({len(played_game_tags)}개):", played_game_tags)
+    print(f"유저 나이: {user_age}")
+
+    # 나이 제한, 보유하지 않은 게임 중 점수 상위 15개씩 선택
+    # 1. 기본 태그 기반 추천 / 2. 플레이한 게임 태그 기반 추천
+    interest_ranked, playtime_ranked = CatalogueMatrix.get().recommend(
+        user_tags, played_game_tags, user_age, owned_game_ids, k=15
+    )
+    recommended_interest_games = load_display_games(interest_ranked)
+    recommended_playtime_games = load_display_games(playtime_ranked)
+
+    print("\n=== 최종 추천 게임 목록 ===")
+    print("기본 태그 기반 추천:")
+    for idx, game in enumerate(recommended_interest_games, 1):
+        print(f"{idx}. {game['name']} (점수: {game['score']})")
+    print("\n플레이타임 기반 추천:")
+    for idx, game in enumerate(recommended_playtime_games, 1):
+        print(f"{idx}. {game['name']} (점수: {game['score']})")
+
+    return {
+        'interest_based_games': recommended_interest_games,
+        'playtime_based_games': recommended_playtime_games,
+        'interest_tags': list(user_tags),  # 기본 태그 리스트
+        'playtime_tags': list(played_game_tags)  # 플레이타임 기반 태그 리스트
+    }
+
+
+def invalidate_recommendations(account_id):
+    """
+    관심사/스팀 데이터 변경 시 유저 버전을 올려 저장된 추천 결과를 오래된 것으로 표시
+    """
+    cache.set(USER_VERSION_KEY.format(account_id=account_id), time.time_ns(), timeout=None)
+
+
+def get_fingerprint(user, versions):
+    """
+    추천 결과를 결정하는 입력 값 (나이, 스팀 연동, 관심사/스팀 데이터 버전, 카탈로그 버전)
+    """
+    user_version = versions.get(USER_VERSION_KEY.format(account_id=user.id))
+    catalogue_version = versions.get(INDEX_VERSION_KEY)
+    source = f"{user.age}:{user.steamId}:{user_version}:{catalogue_version}"
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+def _save_result(user, fingerprint):
+    recommendations = compute_recommendations(user)
+    cache.set(
+        RESULT_KEY.format(account_id=user.id),
+        {"fingerprint": fingerprint, "age": user.age, "recommendations": recommendations},
+        RESULT_TIMEOUT,
+    )
+    return recommendations
+
+
+def _refresh(account_id, fingerprint):
+    close_old_connections()
+    try:
+        user = Account.objects.filter(id=account_id).first()
+        if user:
+            _save_result(user, fingerprint)
+    except Exception as e:
+        print(f"추천 결과 갱신 실패 ({account_id}): {e!r}")
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(account_id)
+        close_old_connections()
+
+
+def schedule_refresh(account_id, fingerprint):
+    with _refreshing_lock:
+        if account_id in _refreshing:
+            return
+        _refreshing.add(account_id)
+    _refresh_executor.submit(_refresh, account_id, fingerprint)
+
+
+def get_recommendations(user):
+    """
+    유저 추천 결과 반환
+    - 입력이 같으면 저장된 결과 그대로 반환
+    - 입력이 바뀌었으면 이전 결과를 반환하고 백그라운드에서 다시 계산
+    - 저장된 결과가 없거나 나이가 바뀌었으면(연령 제한 게임 노출 방지) 바로 계산
+    """
+    result_key = RESULT_KEY.format(account_id=user.id)
+    versions = cache.get_many([
+        result_key, USER_VERSION_KEY.format(account_id=user.id), INDEX_VERSION_KEY,
+    ])
+    fingerprint = get_fingerprint(user, versions)
+
+    cached = versions.get(result_key)
+    if cached is None or cached["age"] != user.age:
+        return _save_result(user, fingerprint)
+    if cached["fingerprint"] != fingerprint:
+        schedule_refresh(user.id, fingerprint)
+    return cached["recommendations"]
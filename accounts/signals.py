@@ -0,0 +1,65 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import (
+    AccountInterest,
+    SteamLibrary,
+    SteamPlaytime,
+    SteamProfile,
+    SteamReview,
+)
+from accounts.recommend import invalidate_recommendations
+from accounts.tag_profile import schedule_tag_profile_refresh
+
+
+@receiver(post_save, sender=AccountInterest)
+@receiver(post_delete, sender=AccountInterest)
+@receiver(post_save, sender=SteamReview)
+@receiver(post_delete, sender=SteamReview)
+@receiver(post_save, sender=SteamPlaytime)
+@receiver(post_delete, sender=SteamPlaytime)
+@receiver(post_save, sender=SteamProfile)
+def refresh_tag_profile(sender, instance, **kwargs):
+    """관심사/스팀 데이터 변경 시 유저 태그 프로필을 다시 계산 대상으로 표시"""
+    schedule_tag_profile_refresh(instance.account_id)
+
+
+@receiver(post_save, sender=AccountInterest)
+@receiver(post_delete, sender=AccountInterest)
+@receiver(post_save, sender=SteamReview)
+@receiver(post_delete, sender=SteamReview)
+@receiver(post_save, sender=SteamPlaytime)
+@receiver(post_delete, sender=SteamPlaytime)
+@receiver(post_save, sender=SteamProfile)
+@receiver(post_save, sender=SteamLibrary)
+def refresh_recommendations(sender, instance, **kwargs):
+    """관심사/스팀 데이터(보유 게임 포함) 변경 시 저장된 추천 결과 무효화"""
+    invalidate_recommendations(instance.account_id)
+
+
+def remove_duplicate_steam_rows(sender, using, **kwargs):
+    """
+    migrate 전 SteamReview/SteamPlaytime의 (account, app_id) 중복 행 삭제 (가장 최근 행만 남김)
+    기존 steam_data는 중복 확인 없이 create 했으므로, 중복이 남아 있으면 UniqueConstraint 추가가 실패함
+    제약 조건이 이미 있는 테이블은 건너뜀
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        for model, constraint in (
+            (SteamReview, "unique_steam_review"),
+            (SteamPlaytime, "unique_steam_playtime"),
+        ):
+            table = model._meta.db_table
+            if table not in tables:
+                continue
+            if constraint in connection.introspection.get_constraints(cursor, table):
+                continue
+            quoted = connection.ops.quote_name(table)
+            cursor.execute(
+                f"DELETE FROM {quoted} a USING {quoted} b "
+                "WHERE a.account_id = b.account_id AND a.app_id = b.app_id AND a.id < b.id"
+            )
+            if cursor.rowcount:
+                print(f"{table} 중복 행 {cursor.rowcount}개 삭제")
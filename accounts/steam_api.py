@@ -0,0 +1,180 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+import environ
+import requests
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class SteamAPIError(requests.exceptions.RequestException):
+    """Steam Web API 호출 실패 (재시도 후에도 실패한 경우)"""
+
+
+class SteamAPIClient:
+    """
+    Steam Web API 공용 클라이언트
+    - 커넥션 풀을 재사용하는 requests.Session
+    - 429/5xx 응답은 지수 백오프로 재시도
+    - 초당 요청 수 제한
+    - 엔드포인트별 TTL로 응답 캐시
+    - 같은 요청이 동시에 들어오면 한 번만 호출하고 결과 공유
+    """
+
+    BASE_URL = "https://api.steampowered.com"
+
+    # 엔드포인트별 응답 캐시 시간 (초)
+    ENDPOINT_TTL = {
+        "IPlayerService/GetOwnedGames/v1": 5 * 60,
+        "IPlayerService/GetRecentlyPlayedGames/v1": 5 * 60,
+        "IPlayerService/GetAnimatedAvatar/v1": 60 * 60,
+        "ISteamUser/GetPlayerSummaries/v2": 5 * 60,
+        "ISteamUser/ResolveVanityURL/v1": 24 * 60 * 60,
+        "IStoreService/GetMostPopularTags/v1": 24 * 60 * 60,
+    }
+
+    def __init__(self, api_key=None, timeout=10, max_requests_per_second=10):
+        self.api_key = api_key if api_key is not None else environ.Env()("STEAM_API_KEY")
+        self.timeout = timeout
+        self.min_interval = 1.0 / max_requests_per_second
+
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def _cache_key(self, endpoint, params):
+        source = json.dumps([endpoint, sorted(params.items())], default=str)
+        return "steam_api:" + hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    def _wait_rate_limit(self):
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def _request(self, endpoint, params):
+        self._wait_rate_limit()
+        try:
+            response = self.session.get(
+                f"{self.BASE_URL}/{endpoint}/",
+                params={"key": self.api_key, **params},
+                timeout=self.timeout,
+            )
+        except requests.exceptions.RequestException as e:
+            raise SteamAPIError(f"{endpoint} 요청 실패: {e}") from e
+
+        if response.status_code != 200:
+            raise SteamAPIError(f"{endpoint} 응답 오류: {response.status_code}", response=response)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise SteamAPIError(f"{endpoint} 응답 파싱 실패") from e
+
+    def get(self, endpoint, params=None, ttl=None, refresh=False):
+        """
+        API 호출 결과(JSON) 반환, 실패 시 SteamAPIError
+        refresh=True면 캐시를 건너뛰고 다시 호출 (결과는 캐시에 저장)
+        """
+        params = params or {}
+        ttl = self.ENDPOINT_TTL.get(endpoint, 0) if ttl is None else ttl
+        key = self._cache_key(endpoint, params)
+
+        if ttl and not refresh:
+            data = cache.get(key)
+            if data is not None:
+                return data
+
+        # 같은 요청이 진행 중이면 그 결과를 기다림
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            data = self._request(endpoint, params)
+            if ttl:
+                cache.set(key, data, ttl)
+            future.set_result(data)
+            return data
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def invalidate(self, endpoint, params=None):
+        cache.delete(self._cache_key(endpoint, params or {}))
+
+    # ---------------------------------------------------
+    # 엔드포인트별 호출
+    # ---------------------------------------------------
+    def get_owned_games(self, steamid, refresh=False):
+        """
+        보유 게임 목록 (게임 이름 포함) - 호출하는 곳이 달라도 같은 캐시를 쓰도록 파라미터 통일
+        """
+        return self.get(
+            "IPlayerService/GetOwnedGames/v1",
+            {"steamid": steamid, "include_appinfo": True},
+            refresh=refresh,
+        )
+
+    def get_recently_played_games(self, steamid, count=3):
+        return self.get(
+            "IPlayerService/GetRecentlyPlayedGames/v1",
+            {"steamid": steamid, "count": count},
+        )
+
+    def get_player_summaries(self, steamids):
+        if not isinstance(steamids, str):
+            steamids = ",".join(steamids)
+        return self.get("ISteamUser/GetPlayerSummaries/v2", {"steamids": steamids})
+
+    def get_animated_avatar(self, steamid):
+        return self.get("IPlayerService/GetAnimatedAvatar/v1", {"steamid": steamid})
+
+    def resolve_vanity_url(self, vanity_url):
+        return self.get("ISteamUser/ResolveVanityURL/v1", {"vanityurl": vanity_url})
+
+    def get_most_popular_tags(self, language=None):
+        params = {"language": language} if language else {}
+        return self.get("IStoreService/GetMostPopularTags/v1", params)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_steam_client():
+    """
+    프로세스 공용 Steam API 클라이언트 반환
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SteamAPIClient()
+    return _client
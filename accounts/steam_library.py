@@ -0,0 +1,122 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+from accounts.models import Account, SteamLibrary
+from accounts.steam_api import SteamAPIError, get_steam_client
+from accounts.steam_resolver import resolve_steam_id
+
+
+# 저장된 보유 게임 목록을 다시 동기화하는 주기
+LIBRARY_TTL = timedelta(hours=6)
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="steam-library")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def fetch_owned_games(steam_id):
+    """
+    GetOwnedGames 호출 -> (플레이 타임 내림차순 게임 목록, 게임 수)
+    """
+    response = get_steam_client().get_owned_games(steam_id, refresh=True).get("response", {})
+    games = sorted(
+        response.get("games", []),
+        key=lambda x: x.get("playtime_forever", 0),
+        reverse=True,
+    )
+    return games, response.get("game_count", len(games))
+
+
+def save_steam_library(account, steam_id, games, game_count):
+    """
+    보유 게임 목록 저장
+    목록이 바뀌지 않았으면 synced_at만 갱신 (post_save 신호로 추천 결과가 무효화되지 않도록)
+    """
+    now = timezone.now()
+    library = SteamLibrary.objects.filter(account_id=account.id).first()
+    if library and library.steam_id == steam_id and library.games == games:
+        SteamLibrary.objects.filter(id=library.id).update(synced_at=now)
+        library.synced_at = now
+        return library
+
+    library, _ = SteamLibrary.objects.update_or_create(
+        account_id=account.id,
+        defaults={
+            "steam_id": steam_id,
+            "games": games,
+            "game_count": game_count,
+            "synced_at": now,
+        },
+    )
+    return library
+
+
+def sync_steam_library(account):
+    """
+    GetOwnedGames로 보유 게임 목록을 가져와 저장
+    """
+    steam_id = resolve_steam_id(account.steamId)
+    if not steam_id:
+        raise SteamAPIError(f"steamid를 확인할 수 없음: {account.steamId}")
+    games, game_count = fetch_owned_games(steam_id)
+    return save_steam_library(account, steam_id, games, game_count)
+
+
+def _refresh(account_id):
+    close_old_connections()
+    try:
+        account = Account.objects.filter(id=account_id).exclude(steamId="").first()
+        if account:
+            sync_steam_library(account)
+    except Exception as e:
+        print(f"스팀 보유 게임 갱신 실패 ({account_id}): {e!r}")
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(account_id)
+        close_old_connections()
+
+
+def schedule_library_refresh(account_id):
+    """
+    보유 게임 목록 백그라운드 갱신 (같은 유저는 동시에 한 번만)
+    """
+    with _refreshing_lock:
+        if account_id in _refreshing:
+            return
+        _refreshing.add(account_id)
+    _refresh_executor.submit(_refresh, account_id)
+
+
+def get_steam_library(account):
+    """
+    저장된 보유 게임 목록 반환 (스팀 미연동이면 None)
+    - 저장된 목록이 없거나 steamId가 바뀌었으면 바로 동기화
+    - 오래된 목록이면 그대로 반환하고 백그라운드에서 갱신
+    """
+    if not account.steamId or not account.steamId.strip():
+        return None
+    steam_id = resolve_steam_id(account.steamId)
+
+    library = SteamLibrary.objects.filter(account_id=account.id).first()
+    if library is None or library.steam_id != steam_id:
+        try:
+            return sync_steam_library(account)
+        except SteamAPIError as e:
+            print(f"스팀 보유 게임 조회 실패: {e}")
+            return None
+
+    if library.synced_at < timezone.now() - LIBRARY_TTL:
+        schedule_library_refresh(account.id)
+    return library
+
+
+def get_owned_games(account):
+    """
+    보유 게임 목록 [{"appid", "name", "playtime_forever", ...}, ...] (플레이 타임 내림차순)
+    """
+    library = get_steam_library(account)
+    return library.games if library else []
@@ -0,0 +1,107 @@
+from django.utils import timezone
+
+from accounts.models import SteamVanity
+from accounts.steam_api import SteamAPIError, get_steam_client
+
+
+# GetPlayerSummaries 한 번에 조회할 수 있는 steamid 수
+SUMMARY_BATCH_SIZE = 100
+
+
+def resolve_steam_ids(values, executor=None):
+    """
+    steamId 입력값(64비트 ID 또는 커스텀 URL) -> 64비트 steamid (변환 실패 시 None)
+    커스텀 URL은 저장된 변환 결과(SteamVanity)를 먼저 보고, 없는 것만 ResolveVanityURL 호출
+    """
+    result = {}
+    vanities = set()
+    for value in values:
+        value = value.strip()
+        if value.isdigit():
+            result[value] = value
+        elif value:
+            vanities.add(value)
+
+    if vanities:
+        stored = dict(
+            SteamVanity.objects.filter(vanity_url__in=vanities).values_list("vanity_url", "steam_id")
+        )
+        result.update(stored)
+
+        missing = sorted(vanities - stored.keys())
+        resolved = list((executor.map if executor else map)(_resolve_vanity_url, missing))
+        result.update(zip(missing, resolved))
+
+        now = timezone.now()
+        SteamVanity.objects.bulk_create(
+            [
+                SteamVanity(vanity_url=vanity, steam_id=steam_id, resolved_at=now)
+                for vanity, steam_id in zip(missing, resolved)
+                if steam_id
+            ],
+            update_conflicts=True,
+            unique_fields=["vanity_url"],
+            update_fields=["steam_id", "resolved_at"],
+        )
+    return result
+
+
+def resolve_steam_id(value):
+    return resolve_steam_ids([value]).get(value.strip())
+
+
+def _resolve_vanity_url(vanity):
+    try:
+        resp = get_steam_client().resolve_vanity_url(vanity)
+    except SteamAPIError as e:
+        print("Error resolving vanity url:", e)
+        return None
+    if resp.get("response", {}).get("success") == 1:
+        return resp["response"]["steamid"]
+    return None
+
+
+def fetch_public_steam_ids(steam_ids):
+    """
+    프로필이 Public(communityvisibilitystate == 3)인 steamid 확인
+    GetPlayerSummaries를 100개씩 묶어서 호출 -> (공개 steamid 집합, 조회 실패한 steamid 집합, 호출 수)
+    조회에 실패한 묶음은 비공개로 보지 않고 실패 집합에 넣음 (호출한 쪽에서 다음에 다시 시도)
+    """
+    steam_ids = sorted(set(steam_ids))
+    public = set()
+    failed = set()
+    calls = 0
+    client = get_steam_client()
+    for i in range(0, len(steam_ids), SUMMARY_BATCH_SIZE):
+        batch = steam_ids[i:i + SUMMARY_BATCH_SIZE]
+        try:
+            resp = client.get_player_summaries(batch)
+        except SteamAPIError as e:
+            print("Error fetching player summaries:", e)
+            failed.update(batch)
+            continue
+        calls += 1
+        for player in resp.get("response", {}).get("players", []):
+            if player.get("communityvisibilitystate", 1) == 3:
+                public.add(player["steamid"])
+    return public, failed, calls
+
+
+def resolve_visibility(accounts, executor=None):
+    """
+    계정들의 64비트 steamid와 프로필 공개 여부
+    -> {account.id: (steamid64, 공개 여부)}, 확인하지 못한 account.id 집합, GetPlayerSummaries 호출 수
+    커스텀 URL 변환 실패, 프로필 조회 실패는 비공개가 아니라 "확인 못함"으로 분류
+    """
+    steam_ids = resolve_steam_ids([account.steamId for account in accounts], executor)
+    by_account = {account.id: steam_ids.get(account.steamId.strip()) for account in accounts}
+    public, failed, calls = fetch_public_steam_ids(s for s in by_account.values() if s)
+
+    visibility = {}
+    unresolved = set()
+    for account_id, steam_id in by_account.items():
+        if not steam_id or steam_id in failed:
+            unresolved.add(account_id)
+        else:
+            visibility[account_id] = (steam_id, steam_id in public)
+    return visibility, unresolved, calls
@@ -1,37 +1,26 @@
-import environ
-import requests
-from django.core.management.base import BaseCommand
-from django.db import transaction
-import re
-from accounts.models import (
-    Account,
-    SteamProfile,
-    SteamReview,
-    SteamPlaytime,
-)
-
 import requests
 from bs4 import BeautifulSoup
+from django.db import transaction
 
+from accounts.models import SteamPlaytime, SteamProfile, SteamReview
+from accounts.steam_api import SteamAPIError, get_steam_client
+from accounts.steam_resolver import fetch_public_steam_ids, resolve_steam_id
 
 
 def sync_new_steam_user_data(account):
     """
     신규 유저(steamId 연동)의 프로필/리뷰/플레이타임 정보를 DB에 저장.
-    - 커스텀 URL 처리 제외
-    - 기존 데이터 전부 삭제 없이, 프로필 공개 여부, 리뷰·플레이타임만 추가(get_or_create)
+    - 커스텀 URL은 64비트 ID로 변환 (저장된 변환 결과 사용)
+    - 기존 데이터 전부 삭제 없이, 프로필 공개 여부, 리뷰·플레이타임만 추가/갱신
+    - 프로필 공개 여부를 확인하지 못하면 SteamAPIError (동기화 작업이 나중에 다시 시도)
     """
-    steam_id_str = account.steamId.strip()
-    if not steam_id_str.isdigit():
-        # 64비트 ID가 아니라면 처리 불가(커스텀 URL 변환 제외)
+    steam_id_str = resolve_steam_id(account.steamId)
+    if not steam_id_str:
+        # 64비트 ID로 변환할 수 없으면 처리 불가
         return
-    
-    # .env에서 Steam API 키 불러오기
-    env = environ.Env()
-    api_key = env("STEAM_API_KEY")
 
     # 1) 프로필 공개 여부
-    if not check_profile_public(api_key, steam_id_str):
+    if not check_profile_public(steam_id_str):
         # 프로필이 Private -> 리뷰/플레이타임 비활성화
         sp, _ = SteamProfile.objects.get_or_create(account=account)
         sp.is_review = False
@@ -44,7 +33,7 @@ def sync_new_steam_user_data(account):
 
 
     # 3) 플레이타임(상위 2개) API 조회
-    playtime_data = fetch_top2_playtime_api(api_key, steam_id_str)
+    playtime_data = fetch_top2_playtime_api(steam_id_str)
 
     is_review = bool(review_data)
     is_playtime = bool(playtime_data)
@@ -65,25 +54,22 @@ def sync_new_steam_user_data(account):
                 )
         if playtime_data:
             for pd in playtime_data:
-                SteamPlaytime.objects.get_or_create(
+                SteamPlaytime.objects.update_or_create(
                     account=account,
-                    app_id=pd["app_id"]
+                    app_id=pd["app_id"],
+                    defaults={"playtime": pd["playtime"]},
                 )
 
 
-def check_profile_public(api_key, steam_id_str):
+def check_profile_public(steam_id_str):
     """
     64비트 steamId (digit)인 경우만 public 여부 확인
+    조회에 실패하면 SteamAPIError (비공개로 저장하지 않고 동기화 작업 재시도)
     """
-    url = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/"
-    params = {"key": api_key, "steamids": steam_id_str}
-    resp = requests.get(url, params=params).json()
-    players = resp.get("response", {}).get("players", [])
-    if not players:
-        return False
-    player = players[0]
-    vis_state = player.get("communityvisibilitystate", 1)
-    return (vis_state == 3)
+    public, failed, _ = fetch_public_steam_ids([steam_id_str])
+    if steam_id_str in failed:
+        raise SteamAPIError(f"프로필 공개 여부 확인 실패: {steam_id_str}")
+    return steam_id_str in public
 
 
 def fetch_top3_reviews(steam_id_str):
@@ -135,15 +121,13 @@ def fetch_top3_reviews(steam_id_str):
     return recommended
 
 
-def fetch_top2_playtime_api(api_key, steam_id_str):
+def fetch_top2_playtime_api(steam_id_str):
     """
     GetOwnedGames API로 플레이타임이 가장 많은 상위 2개 게임(app_id) 반환.
     """
-    url = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
-    params = {"key": api_key, "steamid": steam_id_str}
     try:
-        resp = requests.get(url, params=params).json()
-    except Exception as e:
+        resp = get_steam_client().get_owned_games(steam_id_str)
+    except SteamAPIError as e:
         print("Error fetching owned games:", e)
         return []
 
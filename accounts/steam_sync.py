@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from accounts.models import SteamSyncJob
+from accounts.steam_library import sync_steam_library
+from accounts.steam_service import sync_new_steam_user_data
+
+
+# 실패한 작업 재시도 횟수
+MAX_ATTEMPTS = 3
+
+# 재시도 대기 시간 (실패할 때마다 두 배: 1분, 2분, ...)
+RETRY_DELAY = timedelta(minutes=1)
+
+# 이 시간이 지나도 running인 작업은 워커가 중단된 것으로 보고 다시 대기 상태로
+STALE_RUNNING = timedelta(minutes=10)
+
+
+def enqueue_steam_sync(account):
+    """
+    스팀 동기화 작업 등록 (이미 대기 중인 작업이 있으면 그대로 사용)
+    """
+    try:
+        with transaction.atomic():
+            job, _ = SteamSyncJob.objects.get_or_create(
+                account=account, status=SteamSyncJob.PENDING
+            )
+    except IntegrityError:
+        job = SteamSyncJob.objects.get(account=account, status=SteamSyncJob.PENDING)
+    return job
+
+
+def is_steam_syncing(account):
+    """
+    처리 대기/진행 중인 동기화 작업이 있는지
+    """
+    return SteamSyncJob.objects.filter(
+        account_id=account.id,
+        status__in=[SteamSyncJob.PENDING, SteamSyncJob.RUNNING],
+    ).exists()
+
+
+def claim_jobs(limit=10):
+    """
+    실행할 시간이 된 대기 작업을 running으로 바꿔서 가져옴 (여러 워커가 같은 작업을 가져가지 않도록 skip_locked)
+    """
+    with transaction.atomic():
+        jobs = list(
+            SteamSyncJob.objects.select_for_update(skip_locked=True)
+            .filter(status=SteamSyncJob.PENDING, next_attempt_at__lte=timezone.now())
+            .select_related("account")
+            .order_by("next_attempt_at")[:limit]
+        )
+        SteamSyncJob.objects.filter(id__in=[job.id for job in jobs]).update(
+            status=SteamSyncJob.RUNNING, updated_at=timezone.now()
+        )
+    return jobs
+
+
+def release_stale_jobs():
+    """
+    중단된 워커가 남긴 running 작업을 다시 대기 상태로
+    (같은 유저의 대기 작업이 이미 있으면 중복이므로 완료 처리)
+    """
+    stale = SteamSyncJob.objects.filter(
+        status=SteamSyncJob.RUNNING, updated_at__lt=timezone.now() - STALE_RUNNING
+    )
+    count = 0
+    for job in stale:
+        count += 1
+        if SteamSyncJob.objects.filter(account_id=job.account_id, status=SteamSyncJob.PENDING).exists():
+            SteamSyncJob.objects.filter(id=job.id).update(status=SteamSyncJob.DONE)
+        else:
+            SteamSyncJob.objects.filter(id=job.id).update(status=SteamSyncJob.PENDING)
+    return count
+
+
+def _finish(job, status, error=""):
+    fields = ["status", "attempts", "error", "next_attempt_at", "updated_at"]
+    job.status = status
+    job.error = error
+    try:
+        job.save(update_fields=fields)
+    except IntegrityError:
+        # 처리 중에 같은 유저의 새 작업이 등록된 경우 - 새 작업이 다시 동기화하므로 완료 처리
+        job.status = SteamSyncJob.DONE
+        job.save(update_fields=fields)
+
+
+def run_job(job):
+    """
+    동기화 작업 실행 - 보유 게임 목록, 프로필 공개 여부/리뷰/플레이타임 저장
+    실패 시 MAX_ATTEMPTS까지 다시 대기 상태로 (재시도 간격은 RETRY_DELAY부터 두 배씩)
+    """
+    job.attempts += 1
+    try:
+        sync_steam_library(job.account)
+        sync_new_steam_user_data(job.account)
+    except Exception as e:
+        print(f"스팀 동기화 실패 ({job.account_id}, {job.attempts}회): {e!r}")
+        if job.attempts < MAX_ATTEMPTS:
+            status = SteamSyncJob.PENDING
+            job.next_attempt_at = timezone.now() + RETRY_DELAY * 2 ** (job.attempts - 1)
+        else:
+            status = SteamSyncJob.FAILED
+        _finish(job, status, repr(e))
+        return False
+
+    _finish(job, SteamSyncJob.DONE)
+    return True
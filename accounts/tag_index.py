@@ -0,0 +1,335 @@
+import json
+import threading
+import time
+
+import numpy as np
+import requests
+from bs4 import BeautifulSoup
+from django.core.cache import cache
+from fake_useragent import UserAgent
+
+from accounts.models import Game, GameTagIndex, Tag
+
+
+# 프로세스 내 조회 결과 캐시 {app_id: (만료 시각, [steam_tag_id, ...])}
+MEMO_TIMEOUT = 60 * 60
+# 상점 페이지 조회에 실패한 게임은 저장하지 않고, 이 시간 동안만 빈 목록으로 기억 (다시 크롤링 방지)
+FAILED_MEMO_TIMEOUT = 60 * 5
+_memo = {}
+_memo_lock = threading.Lock()
+
+# 인덱스가 다시 만들어질 때마다 바뀌는 버전 (다른 프로세스의 역색인 재생성 판단용)
+INDEX_VERSION_KEY = "game_tag_index_version"
+
+# 소유자 수 구간별 인기도 점수
+OWNERS_RANGES = {
+    "0 - 20000": 10,
+    "20000 - 50000": 20,
+    "50000 - 100000": 30,
+    "100000 - 200000": 40,
+    "200000 - 500000": 50,
+    "500000 - 1000000": 60,
+    "1000000 - 2000000": 70,
+    "2000000 - 5000000": 80,
+    "5000000 - 10000000": 90,
+    "10000000 - 20000000": 100,
+    "20000000 - 50000000": 110,
+    "50000000 - 100000000": 120,
+    "100000000 - 200000000": 130,
+}
+
+
+def get_tag_name_map():
+    """
+    Tag 영문 이름 -> steam_tag_id 딕셔너리
+    """
+    return {
+        name_en: steam_tag_id
+        for name_en, steam_tag_id in Tag.objects.exclude(steam_tag_id=0).values_list(
+            "name_en", "steam_tag_id"
+        )
+    }
+
+
+def tag_ids_from_names(names, name_map):
+    """
+    태그 이름 목록을 순서를 유지한 steam_tag_id 목록으로 변환
+    """
+    tag_ids = []
+    for name in names:
+        tag_id = name_map.get(name)
+        if tag_id and tag_id not in tag_ids:
+            tag_ids.append(tag_id)
+    return tag_ids
+
+
+def tag_names_from_game(tags):
+    """
+    Game.tags(JSON) 값을 투표 수 내림차순 태그 이름 목록으로 변환
+    """
+    if isinstance(tags, str):
+        tags = json.loads(tags) if tags else {}
+    if isinstance(tags, dict):
+        return [name for name, _ in sorted(tags.items(), key=lambda x: x[1], reverse=True)]
+    return list(tags)
+
+
+def fetch_store_game_tag(app_id, name_map=None):
+    """
+    스팀 상점 페이지에서 게임의 인기 태그(steam_tag_id) 가져오는 함수
+    - 게임 페이지에 태그가 없으면 빈 목록
+    - 요청 실패, 200이 아닌 응답(429 등), 게임 페이지가 아닌 응답이면 None (저장하지 않고 나중에 다시 시도)
+    """
+    url = f"https://store.steampowered.com/app/{app_id}/"
+    cookies = {
+        "birthtime": "568022401",
+        "lastagecheckage": "1-January-1990",
+    }
+    headers = {"User-Agent": UserAgent().random}
+
+    try:
+        response = requests.get(url, cookies=cookies, headers=headers, timeout=10)
+    except requests.exceptions.RequestException as e:
+        print(f"게임 태그 조회 실패 ({app_id}): {e}")
+        return None
+    if response.status_code != 200:
+        print(f"게임 태그 조회 실패 ({app_id}): HTTP {response.status_code}")
+        return None
+
+    soup = BeautifulSoup(response.text, "html.parser")
+    div = soup.find("div", class_="glance_tags popular_tags")
+    if not div:
+        # 게임 페이지(게임 이름 영역)가 맞으면 태그가 없는 게임, 아니면 조회 실패
+        if soup.find("div", id="appHubAppName") or soup.find("div", class_="apphub_AppName"):
+            return []
+        print(f"게임 태그 조회 실패 ({app_id}): 게임 페이지가 아님")
+        return None
+
+    descriptors = [tag.text.strip() for tag in div.find_all("a", class_="app_tag")]
+    return tag_ids_from_names(descriptors, name_map or get_tag_name_map())
+
+
+def get_game_tag_ids(app_id):
+    """
+    게임의 인기 태그(steam_tag_id) 목록 조회
+    프로세스 캐시 -> GameTagIndex 순서로 찾고, 둘 다 없을 때만 상점 페이지를 크롤링한 뒤 인덱스에 저장
+    """
+    try:
+        app_id = int(app_id)
+    except (TypeError, ValueError):
+        return []
+
+    now = time.monotonic()
+    with _memo_lock:
+        cached = _memo.get(app_id)
+    if cached and cached[0] > now:
+        return list(cached[1])
+
+    tag_ids = (
+        GameTagIndex.objects.filter(app_id=app_id)
+        .values_list("tag_ids", flat=True)
+        .first()
+    )
+    if tag_ids is None:
+        tag_ids = fetch_store_game_tag(app_id)
+        if tag_ids is None:
+            with _memo_lock:
+                _memo[app_id] = (now + FAILED_MEMO_TIMEOUT, [])
+            return []
+        GameTagIndex.objects.update_or_create(
+            app_id=app_id,
+            defaults={"tag_ids": tag_ids, "source": GameTagIndex.SOURCE_STORE},
+        )
+
+    with _memo_lock:
+        _memo[app_id] = (now + MEMO_TIMEOUT, tag_ids)
+    return list(tag_ids)
+
+
+def rebuild_game_tag_index(batch_size=1000):
+    """
+    Game.tags 데이터로 GameTagIndex 전체를 다시 만든다
+    """
+    name_map = get_tag_name_map()
+    entries = []
+    count = 0
+    for app_id, tags in Game.objects.values_list("appID", "tags").iterator():
+        entries.append(
+            GameTagIndex(
+                app_id=app_id,
+                tag_ids=tag_ids_from_names(tag_names_from_game(tags), name_map),
+                source=GameTagIndex.SOURCE_DATASET,
+            )
+        )
+        if len(entries) >= batch_size:
+            count += _bulk_upsert(entries)
+            entries = []
+    if entries:
+        count += _bulk_upsert(entries)
+
+    clear_memo()
+    bump_index_version()
+    return count
+
+
+def refresh_store_game_tags():
+    """
+    데이터셋에 없어 상점 페이지에서 가져온 게임들의 태그를 다시 크롤링
+    """
+    name_map = get_tag_name_map()
+    count = 0
+    for entry in GameTagIndex.objects.filter(source=GameTagIndex.SOURCE_STORE).iterator():
+        tag_ids = fetch_store_game_tag(entry.app_id, name_map)
+        if tag_ids is None:
+            continue
+        entry.tag_ids = tag_ids
+        entry.save(update_fields=["tag_ids", "updated_at"])
+        count += 1
+
+    clear_memo()
+    return count
+
+
+def clear_memo():
+    with _memo_lock:
+        _memo.clear()
+
+
+def bump_index_version():
+    cache.set(INDEX_VERSION_KEY, time.time(), timeout=None)
+
+
+def _bulk_upsert(entries):
+    GameTagIndex.objects.bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=["app_id"],
+        update_fields=["tag_ids", "source", "updated_at"],
+    )
+    return len(entries)
+
+
+class GameTagPostings:
+    """
+    steam_tag_id -> 게임 목록 역색인 (프로세스 당 1개)
+    게임은 인기도(소유자 수, 메타크리틱) 순으로 번호를 매기고, 태그별로 정렬된 번호 배열을 저장한다
+    따라서 태그 조건의 교집합/합집합 결과는 그대로 인기순 정렬 상태가 된다
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls):
+        """
+        현재 인덱스 버전에 맞는 역색인 반환 (버전이 바뀌었으면 다시 생성)
+        """
+        version = cache.get(INDEX_VERSION_KEY)
+        instance = cls._instance
+        if instance is None or instance.version != version:
+            with cls._lock:
+                instance = cls._instance
+                if instance is None or instance.version != version:
+                    instance = cls.build(version)
+                    cls._instance = instance
+        return instance
+
+    @classmethod
+    def build(cls, version=None):
+        index_tags = dict(GameTagIndex.objects.values_list("app_id", "tag_ids"))
+        rows = [
+            (OWNERS_RANGES.get(owners, 0), metacritic or 0, app_id)
+            for app_id, owners, metacritic in Game.objects.values_list(
+                "appID", "estimated_owners", "metacritic_score"
+            )
+            if app_id in index_tags
+        ]
+        # 인기도 내림차순, 동점이면 app_id 오름차순
+        rows.sort(key=lambda x: (-x[0], -x[1], x[2]))
+
+        app_ids = [app_id for _, _, app_id in rows]
+        tag_lists = [index_tags[app_id] for app_id in app_ids]
+
+        postings = {}
+        for position, tag_ids in enumerate(tag_lists):
+            for tag_id in tag_ids:
+                postings.setdefault(tag_id, []).append(position)
+
+        return cls(
+            app_ids,
+            tag_lists,
+            {tag_id: np.array(p, dtype=np.int32) for tag_id, p in postings.items()},
+            version,
+        )
+
+    def __init__(self, app_ids, tag_lists, postings, version=None):
+        self.app_ids = app_ids
+        self.tag_lists = tag_lists
+        self.postings = postings
+        self.positions = {app_id: position for position, app_id in enumerate(app_ids)}
+        self.version = version
+
+    def _posting(self, tag_id):
+        return self.postings.get(int(tag_id), np.empty(0, dtype=np.int32))
+
+    def _union(self, tag_ids):
+        arrays = [self._posting(tag_id) for tag_id in tag_ids]
+        if not arrays:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(arrays))
+
+    @staticmethod
+    def _intersect(a, b):
+        """정렬된 두 번호 배열의 교집합 (작은 배열 기준 이진 탐색)"""
+        if len(a) > len(b):
+            a, b = b, a
+        if not len(a) or not len(b):
+            return np.empty(0, dtype=np.int32)
+        idx = np.searchsorted(b, a).clip(max=len(b) - 1)
+        return a[b[idx] == a]
+
+    def search(
+        self,
+        all_tags=(),
+        any_tags=(),
+        exclude_tags=(),
+        exclude_app_ids=(),
+        limit=50,
+    ):
+        """
+        태그 조건으로 게임 검색
+        - all_tags: 모두 포함해야 하는 태그 (AND)
+        - any_tags: 하나 이상 포함해야 하는 태그 (OR)
+        - exclude_tags: 하나라도 포함하면 제외할 태그 (미성년자 제한 태그 등)
+        - exclude_app_ids: 제외할 게임 (사용자 보유 게임 등)
+        결과는 인기순 [(app_id 문자열, [steam_tag_id, ...]), ...]
+        """
+        result = None
+        for posting in sorted((self._posting(t) for t in all_tags), key=len):
+            result = posting if result is None else self._intersect(result, posting)
+        if any_tags:
+            union = self._union(any_tags)
+            result = union if result is None else self._intersect(result, union)
+        if result is None:
+            result = np.arange(len(self.app_ids), dtype=np.int32)
+
+        if len(result) and exclude_tags:
+            result = result[~np.isin(result, self._union(exclude_tags))]
+
+        excluded = set()
+        for app_id in exclude_app_ids:
+            try:
+                position = self.positions.get(int(app_id))
+            except (TypeError, ValueError):
+                continue
+            if position is not None:
+                excluded.add(position)
+
+        games = []
+        for position in result:
+            if position in excluded:
+                continue
+            games.append((str(self.app_ids[position]), self.tag_lists[position]))
+            if len(games) == limit:
+                break
+        return games
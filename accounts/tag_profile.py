@@ -0,0 +1,146 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from accounts.models import (
+    Account,
+    AccountInterest,
+    InterestTag,
+    SteamPlaytime,
+    SteamProfile,
+    SteamReview,
+    UserTagProfile,
+)
+from accounts.tag_index import get_game_tag_ids
+
+
+# 한 번에 다시 계산할 프로필 수 (steam_sync_worker 한 바퀴 당)
+STALE_BATCH_SIZE = 50
+
+
+def get_interest_tag_groups(account_id):
+    """
+    관심사 가져오기 - interest_id 별로 그룹화된 steam_tag_id 리스트 반환
+    """
+    interest_ids = AccountInterest.objects.filter(account_id=account_id).values_list(
+        "interest_id", flat=True
+    )
+    interest_tags = InterestTag.objects.filter(
+        interest_id__in=interest_ids
+    ).values_list("interest_id", "tag__steam_tag_id")
+
+    grouped_result = defaultdict(list)
+    for interest_id, steam_tag_id in interest_tags:
+        grouped_result[interest_id].append(steam_tag_id)
+
+    return list(grouped_result.values())
+
+
+def get_steam_game_ids(account):
+    """
+    스팀 연동 유저의 리뷰 게임(없으면 플레이 타임 상위 게임) 아이디 가져오는 함수
+    """
+    if not account.steamId:
+        return []
+
+    if SteamProfile.objects.filter(account_id=account.id, is_review=1).exists():
+        app_id = SteamReview.objects.filter(account_id=account.id)
+    elif SteamProfile.objects.filter(account_id=account.id, is_playtime=1).exists():
+        app_id = SteamPlaytime.objects.filter(account_id=account.id)
+    else:
+        return []
+    return list(app_id.values_list("app_id", flat=True))
+
+
+def build_tag_groups(account):
+    """
+    사용자의 관심사 + 리뷰 + 플레이 타임 게임 태그 계산
+    """
+    tag_groups = get_interest_tag_groups(account.id)
+    for app_id in get_steam_game_ids(account):
+        game_tag = get_game_tag_ids(app_id)
+        if game_tag:
+            tag_groups.append(game_tag)
+    return tag_groups
+
+
+def refresh_user_tag_profile(account):
+    """
+    유저 태그 프로필 다시 계산 후 저장
+    """
+    tag_groups = build_tag_groups(account)
+    tag_ids = sorted({tag for group in tag_groups for tag in group})
+    profile, _ = UserTagProfile.objects.update_or_create(
+        account=account,
+        defaults={"tag_groups": tag_groups, "tag_ids": tag_ids},
+    )
+    return profile
+
+
+def get_user_tag_profile(account):
+    """
+    저장된 유저 태그 프로필 반환 (없으면 새로 계산)
+    다시 계산이 필요한(is_stale) 프로필은 백그라운드에서 갱신될 때까지 기존 값 사용
+    """
+    profile = UserTagProfile.objects.filter(account_id=account.id).first()
+    if profile is None:
+        profile = refresh_user_tag_profile(account)
+    return profile
+
+
+def mark_tag_profiles_stale(account_ids):
+    """
+    유저 태그 프로필을 다시 계산 대상으로 표시 (계산은 refresh_stale_tag_profiles에서)
+    프로필이 아직 없는 유저는 빈 프로필을 is_stale로 만들어 둠
+    """
+    account_ids = set(account_ids)
+    UserTagProfile.objects.filter(
+        account_id__in=account_ids, is_stale=False
+    ).update(is_stale=True)
+    UserTagProfile.objects.bulk_create(
+        [UserTagProfile(account_id=account_id, is_stale=True) for account_id in account_ids],
+        ignore_conflicts=True,
+    )
+
+
+def create_missing_tag_profiles(limit=STALE_BATCH_SIZE):
+    """
+    태그 프로필이 없는 유저(신규 가입 등)의 빈 프로필을 is_stale로 생성 -> 생성 대상 수
+    """
+    account_ids = list(
+        Account.objects.filter(tag_profile__isnull=True)
+        .order_by("id")
+        .values_list("id", flat=True)[:limit]
+    )
+    if account_ids:
+        mark_tag_profiles_stale(account_ids)
+    return len(account_ids)
+
+
+def schedule_tag_profile_refresh(account_id):
+    """
+    트랜잭션 커밋 후 유저 태그 프로필을 다시 계산 대상으로 표시
+    요청 처리 중에는 계산하지 않음 (게임 태그 크롤링이 필요할 수 있으므로)
+    """
+    transaction.on_commit(lambda: mark_tag_profiles_stale([account_id]))
+
+
+def refresh_stale_tag_profiles(limit=STALE_BATCH_SIZE):
+    """
+    is_stale로 표시된 유저 태그 프로필 다시 계산 -> 갱신한 수
+    계산 전에 표시를 지우므로, 계산 중에 다시 바뀐 프로필은 다음 차례에 다시 계산됨
+    프로필이 없는 유저도 먼저 is_stale 프로필을 만들어 함께 계산 (유사 유저 검색 대상에 포함)
+    """
+    create_missing_tag_profiles(limit)
+    account_ids = list(
+        UserTagProfile.objects.filter(is_stale=True)
+        .order_by("updated_at")
+        .values_list("account_id", flat=True)[:limit]
+    )
+    count = 0
+    for account in Account.objects.filter(id__in=account_ids):
+        if not UserTagProfile.objects.filter(account_id=account.id, is_stale=True).update(is_stale=False):
+            continue  # 다른 워커가 이미 처리
+        refresh_user_tag_profile(account)
+        count += 1
+    return count
@@ -1,3 +1,61 @@
-from django.test import TestCase
+import numpy as np
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from accounts.management.commands.bench_recommend import legacy_recommend, make_catalogue
+from accounts.recommend import CatalogueMatrix
+
+
+def catalogue_row(app_id, age=0, metacritic=80, playtime=600, owners="0 - 20000", tags=("Action",)):
+    return (app_id, age, metacritic, playtime, owners, {tag: 1 for tag in tags}, ["Indie"], ["Single-player"])
+
+
+class CatalogueMatrixTest(SimpleTestCase):
+    """행렬 추천 점수 계산이 기존 반복문 계산과 같은지 확인"""
+
+    def assertSameAsLegacy(self, rows, user_tags, played_tags, age, owned, k):
+        result = CatalogueMatrix.from_rows(rows).recommend(user_tags, played_tags, age, owned, k=k)
+        expected = legacy_recommend(rows, user_tags, played_tags, age, owned, k=k)
+        self.assertEqual([list(r) for r in result], [list(e) for e in expected])
+        return result
+
+    def test_ties_keep_catalogue_order(self):
+        """동점 게임은 카탈로그 순서대로, k개에서 잘림"""
+        rows = [catalogue_row(app_id) for app_id in range(1, 8)]
+        rows.append(catalogue_row(8, tags=("Action", "RPG")))
+        interest, _ = self.assertSameAsLegacy(rows, {"action", "rpg"}, {"action"}, 18, set(), k=4)
+        self.assertEqual([app_id for app_id, _ in interest], [8, 1, 2, 3])
+        self.assertEqual(interest[1][1], interest[3][1])
+
+    def test_age_and_owned_games_are_excluded(self):
+        """나이 제한을 넘는 게임, 보유한 게임은 점수가 높아도 제외"""
+        rows = [
+            catalogue_row(1, age=18, tags=("Action", "RPG", "Horror")),
+            catalogue_row(2, tags=("Action", "RPG")),
+            catalogue_row(3, age=12, tags=("Action",)),
+            catalogue_row(4, metacritic=50, tags=("Action",)),
+            catalogue_row(5, age=15),
+        ]
+        interest, playtime = self.assertSameAsLegacy(
+            rows, {"action", "rpg", "horror"}, {"action"}, 12, {2}, k=5
+        )
+        self.assertEqual([app_id for app_id, _ in interest], [3, 4])
+        # 메타크리틱 75 미만이고 소유자가 적은 게임은 플레이타임 기반 후보가 아님
+        self.assertEqual([app_id for app_id, _ in playtime], [3])
+
+    def test_random_catalogue_matches_legacy(self):
+        rows = make_catalogue(2000, seed=1)
+        self.assertSameAsLegacy(
+            rows,
+            {"tag1", "tag7", "genre2", "category3"},
+            {"tag3", "genre5", "category1"},
+            15,
+            set(range(1, 300, 7)),
+            k=15,
+        )
+
+    def test_top_k(self):
+        scores = np.array([5, 9, 5, 7, 5, 9])
+        mask = np.array([True, True, True, True, True, False])
+        positions, top = CatalogueMatrix.top_k(scores, mask, 3)
+        self.assertEqual(positions.tolist(), [1, 3, 0])
+        self.assertEqual(top.tolist(), [9, 7, 5])
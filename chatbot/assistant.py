@@ -11,6 +11,11 @@ from langchain.schema.runnable import Runnable, RunnableSequence
 from langchain.schema import LLMResult, AIMessage, SystemMessage, HumanMessage
 from accounts.models import SteamProfile, SteamReview, SteamPlaytime
 from accounts.models import Tag, InterestTag, AccountInterest
+from accounts.tag_index import GameTagPostings, get_game_tag_ids
+from chatbot.enrichment import enrich_games
+from chatbot.intent import IntentCache, classify_by_rules
+from chatbot.registry import get_http_client
+from chatbot.tag_matcher import get_tag_matcher
 from fake_useragent import UserAgent
 from collections import defaultdict
 import json
@@ -121,9 +126,15 @@ class Assistant():
         self.config = config
         self.restrict_id = [12095, 6650, 5611, 9130, 24904]
 
+        # 의도 분류 결과 캐시
+        self.intent_cache = IntentCache()
+
         # LangChain의 ChatOpenAI 모델 초기화
         self.llm = ChatOpenAI(
-            temperature=config.temperature, model=config.llm_model)
+            temperature=config.temperature,
+            model=config.llm_model,
+            http_client=get_http_client(),
+        )
 
         # JSON 출력 파서 설정
         self.agent_parser = JsonOutputParser(pydantic_object=AgentAction)
@@ -337,38 +348,9 @@ class Assistant():
 
     def get_game_tag(self, app_id):
         """
-        게임의 인기 태그 가져오는 함수
+        게임의 인기 태그 가져오는 함수 (로컬 GameTagIndex 조회)
         """
-        url = f"https://store.steampowered.com/app/{app_id}/"
-        cookies = {
-            'birthtime': '568022401',
-            'lastagecheckage': '1-January-1990',
-        }
-
-        ua = UserAgent()
-        headers = {
-            "User-Agent": ua.random
-        }
-
-        response = requests.get(url, cookies=cookies, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # content_descriptors 찾기
-        div = soup.find('div', class_='glance_tags popular_tags')
-
-        # div 정보 없을 때 그냥 반환
-        if not div:
-            return div
-        else:
-            app_tags = div.find_all('a', class_='app_tag')
-
-            # div는 있되 app_tag 없을 때 그냥 반환
-            if not app_tags:
-                return app_tags
-            else:
-                descriptors = [tag.text.strip() for tag in app_tags]
-                tags = Tag.objects.filter(name_en__in=descriptors).values_list('steam_tag_id', flat=True)
-                return tags
+        return get_game_tag_ids(app_id)
             
 
     def get_tagid(self, request):
@@ -438,13 +420,16 @@ class Assistant():
         """
         실제 검색하고자 하는 태그 추출 (관심사, 스팀 데이터 반영)
         """
-        tags = list(Tag.objects.values("name_ko", "steam_tag_id"))
+        # 태그 사전, 동의어로 사용자 입력에서 태그 추출
+        matcher = get_tag_matcher()
+        input_tag = matcher.match(query)
 
-        # LLM 호출
-        input_tag = self.inputchain.invoke({
-            "user_input": query,
-            "tags": tags
-        })
+        # 찾지 못했을 때만 입력과 관련 있는 후보 태그로 LLM 호출
+        if not input_tag:
+            input_tag = self.inputchain.invoke({
+                "user_input": query,
+                "tags": matcher.shortlist(query)
+            })
 
         # 사용자 입력에서 태그 발견 못 할 시
         if not input_tag:
@@ -479,91 +464,45 @@ class Assistant():
 
     def search_filter(self, request, tags, input_tag, user_game):
         """
-        태그를 통한 게임 검색 진행
+        태그를 통한 게임 검색 진행 (로컬 태그 역색인 사용)
         """
-        tags_str = ",".join(map(str, tags))
-        url = f'https://store.steampowered.com/search/?ignore_preferences=1&tags={tags_str}&ndl=1'
-
-        # User-Agent 설정
-        ua = UserAgent()
-        headers = {
-            "User-Agent": ua.random
-        }
-
-        # HTTP GET 요청 및 파싱
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # id가 'search_resultsRows'인 div 찾기
-        container = soup.find('div', id='search_resultsRows')
-
-        # 'search_resultsRows' 안에 있는 직계 <a> 태그들을 최대 50개까지 가져오기
-        links = container.find_all('a', recursive=False, limit=50) if container else []
+        # 태그를 모두 포함하는 게임을 인기순으로 최대 50개까지 가져오기
+        # 사용자가 플레이 했던 게임, 미성년자 제한 태그가 붙은 게임은 검색 단계에서 제외
+        links = GameTagPostings.get().search(
+            all_tags=tags,
+            exclude_tags=self.restrict_id if request.user.age < 20 else (),
+            exclude_app_ids=user_game,
+            limit=50,
+        )
 
         # 결과 아무것도 없으면 바로 안내 문구 반환
         if not links:
             return self.config.not_result_message
 
-        # 각 <a> 태그에서 data-ds-appid 속성 추출
         app_ids = []
         sub_link = []
-        count = 0
         random_links = random.sample(links, len(links))
-        for link in random_links: 
-            tagids = link.get('data-ds-tagids')
-            appid = link.get('data-ds-appid')
-
-            # 인기 태그 정보 없을 때, 번들과 같이 appid가 없는 대상일 경우 스킵
-            if not tagids or not appid:
+        for appid, tagids in random_links:
+            # 사용자 입력과 크게 연관 없을 때 예비 용으로 저장 후 일단 스킵
+            if not any(tag in tagids for tag in input_tag):
+                sub_link.append(appid)
                 continue
 
-            # 사용자가 플레이 했던 게임, 이미 검색된 게임은 제외
-            if appid not in user_game and appid not in app_ids:
-                # 사용자 입력과 크게 연관 없을 때 예비 용으로 저장 후 일단 스킵
-                if not any(tag in json.loads(tagids) for tag in input_tag):
-                    sub_link.append(link)
-                    continue
+            app_ids.append(appid)
 
-                # 미성년자일 때 검색 결과 필터링
-                if request.user.age < 20:   
-                    if not any(tag in json.loads(tagids) for tag in self.restrict_id):
-                        app_ids.append(appid) 
-                        count += 1
-                else:
-                    app_ids.append(appid)
-                    count += 1
-                
             # 수집된 결과 3개 채워졌으면 반복문 탈출
-            if count == 3:
+            if len(app_ids) == 3:
                 break
 
-        if count < 3:
-            for link in sub_link: 
-                tagids = link.get('data-ds-tagids')
-                appid = link.get('data-ds-appid')
+        # 부족한 개수는 예비 결과로 채우기
+        app_ids.extend(sub_link[:3 - len(app_ids)])
 
-                # 사용자가 플레이 했던 게임, 이미 추출된 게임은 제외
-                if appid not in user_game and appid not in app_ids:
-                    # 미성년자일 때 검색 결과 필터링
-                    if request.user.age < 20:   
-                        if not any(tag in json.loads(tagids) for tag in self.restrict_id):
-                            app_ids.append(appid) 
-                            count += 1
-                    else:
-                        app_ids.append(appid)
-                        count += 1
-                    
-                # 수집된 결과 3개 채워졌으면 반복문 탈출
-                if count == 3:
-                    break
-        
         # app_id가 아무것도 모이지 않았을 때 안내 문구 반환
         if not app_ids:
             return self.config.not_result_message
         return app_ids
 
 
-    
     def get_game_info(self, game_id):
         """
         스팀 상세 페이지 내의 게임 설명 추출
@@ -580,7 +519,7 @@ class Assistant():
             "User-Agent": ua.random
         }
 
-        response = requests.get(url, cookies=cookies, headers=headers)
+        response = requests.get(url, cookies=cookies, headers=headers, timeout=10)
         soup = BeautifulSoup(response.text, 'html.parser')
 
         # 짧은 설명, 긴 설명 둘 다 추출
@@ -630,7 +569,7 @@ class Assistant():
             url = base_url.format(cursor=cursor)
             
             # API 호출
-            response = requests.get(url)
+            response = requests.get(url, timeout=10)
             data = response.json()
 
             # 리뷰 수집
@@ -714,23 +653,8 @@ class Assistant():
         
         # 게임 설명 요약 정보
         game_information = {"message": "다음과 같은 게임을 추천드립니다. 🕵️","game_data": []}
-        for id in search_game_id[0:3]:
-            if id:
-                game_info, game_data = self.get_game_info(id)
-                game_review = self.get_game_review(id)
-                # LLM 호출
-                game_summary = self.summarychain.invoke({
-                    "short_inform": game_info['short_inform'],
-                    "long_inform": game_info['long_inform'],
-                    "good_review": game_review['good_review'],
-                    "bad_review": game_review['bad_review']
-                })
-                
-                if game_summary:
-                    game_data['description'] = game_summary['description']
-                    game_data['good_review'] = game_summary['good_review']
-                    game_data['bad_review'] = game_summary['bad_review']
-                    game_information["game_data"].append(game_data)
+        # 게임별 정보 수집, 리뷰 수집, 요약을 동시에 진행
+        game_information["game_data"].extend(enrich_games(self, search_game_id[0:3]))
 
         return game_information
 
@@ -813,22 +737,8 @@ class Assistant():
 
         # 게임 설명 요약 정보
         game_information = {"message": "검색하신 게임에 대한 정보입니다. 🕵️", "game_data": []}
-        if game_id[0]:
-            game_info, game_data = self.get_game_info(game_id[0])
-            game_review = self.get_game_review(game_id[0])
-            # LLM 호출
-            game_summary = self.summarychain.invoke({
-                "short_inform": game_info['short_inform'],
-                "long_inform": game_info['long_inform'],
-                "good_review": game_review['good_review'],
-                "bad_review": game_review['bad_review']
-            })
-            
-            if game_summary:
-                game_data['description'] = game_summary['description']
-                game_data['good_review'] = game_summary['good_review']
-                game_data['bad_review'] = game_summary['bad_review']
-                game_information["game_data"].append(game_data)
+        # 정보 수집, 리뷰 수집을 동시에 진행 후 요약
+        game_information["game_data"].extend(enrich_games(self, game_id[0:1]))
 
         return game_information
     
@@ -932,24 +842,8 @@ class Assistant():
         # 게임 설명 요약 정보
         game_information = {
             "message": "다음과 같은 게임을 추천드립니다. 🕵️", "game_data": []}
-        for id in search_game_id[0:3]:
-            if id:
-                game_info, game_data = self.get_game_info(id)
-                game_review = self.get_game_review(id)
-                # LLM 호출
-                game_summary = self.summarychain.invoke({
-                    "short_inform": game_info['short_inform'],
-                    "long_inform": game_info['long_inform'],
-                    "good_review": game_review['good_review'],
-                    "bad_review": game_review['bad_review']
-
-                })
-
-                if game_summary:
-                    game_data['description'] = game_summary['description']
-                    game_data['good_review'] = game_summary['good_review']
-                    game_data['bad_review'] = game_summary['bad_review']
-                    game_information["game_data"].append(game_data)
+        # 게임별 정보 수집, 리뷰 수집, 요약을 동시에 진행
+        game_information["game_data"].extend(enrich_games(self, search_game_id[0:3]))
 
         return game_information
 
@@ -959,7 +853,11 @@ class Assistant():
         사용자 질문을 처리하고 적절한 응답을 생성하는 메인 메서드
         """
         try:
-            result = self.chain.invoke({"input": query})
+            # 규칙으로 바로 분류되면 사용, 아니면 같거나 비슷한 질문의 분류 결과 재사용
+            result = classify_by_rules(query) or self.intent_cache.get(query)
+            if result is None:
+                result = self.chain.invoke({"input": query})
+                self.intent_cache.put(query, result)
 
             # 분석 결과에서 필요한 정보 추출
             action = result["action"]  # 수행할 액션
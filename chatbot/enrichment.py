@@ -0,0 +1,191 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+from chatbot.models import GameSummary
+
+
+# 게임 정보 수집, 요약에 사용하는 공용 스레드 풀 (프로세스 당 동시 작업 수 제한)
+MAX_WORKERS = 8
+FETCH_TIMEOUT = 15
+SUMMARY_TIMEOUT = 30
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="enrich")
+
+# 저장된 요약 재사용 기준
+# - 리뷰는 최근 100일 기준으로 수집하므로 7일 단위 구간이 바뀌면 새로 요약
+# - 같은 구간이어도 하루가 지나면 저장된 요약을 먼저 응답하고 뒤에서 갱신
+REVIEW_WINDOW_SECONDS = 7 * 24 * 60 * 60
+SUMMARY_TTL = timedelta(days=1)
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="summary-refresh")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def _result(future, deadline, app_id, stage):
+    """
+    남은 시간 안에 작업 결과 반환 (시간 초과, 실패 시 None)
+    """
+    try:
+        return future.result(timeout=max(deadline - time.monotonic(), 0))
+    except Exception as e:
+        future.cancel()
+        print(f"게임 {stage} 실패 ({app_id}): {e!r}")
+        return None
+
+
+def get_prompt_version(assistant):
+    """
+    요약 프롬프트 내용으로 만든 버전 값 (프롬프트가 바뀌면 저장된 요약을 쓰지 않음)
+    """
+    template = assistant.summary_template.template
+    return hashlib.sha1(template.encode("utf-8")).hexdigest()[:12]
+
+
+def get_review_window():
+    return int(time.time() // REVIEW_WINDOW_SECONDS)
+
+
+def _summary_key(assistant):
+    return get_prompt_version(assistant), assistant.config.llm_model
+
+
+def get_cached_summaries(assistant, app_ids):
+    """
+    저장된 요약 조회
+    {app_id: (game_data, 최신 여부)} 반환, 같은 조건의 요약 중 가장 최근 구간 것을 사용
+    """
+    prompt_version, model = _summary_key(assistant)
+    review_window = get_review_window()
+    stale_before = timezone.now() - SUMMARY_TTL
+
+    ids = {int(app_id): app_id for app_id in app_ids}
+    summaries = (
+        GameSummary.objects.filter(
+            app_id__in=ids.keys(), prompt_version=prompt_version, model=model
+        )
+        .order_by("app_id", "-review_window")
+        .distinct("app_id")
+    )
+
+    cached = {}
+    for summary in summaries:
+        fresh = summary.review_window == review_window and summary.updated_at >= stale_before
+        cached[ids[summary.app_id]] = (dict(summary.game_data), fresh)
+    return cached
+
+
+def save_summaries(assistant, game_list):
+    prompt_version, model = _summary_key(assistant)
+    review_window = get_review_window()
+    for app_id, game_data in game_list.items():
+        GameSummary.objects.update_or_create(
+            app_id=int(app_id),
+            prompt_version=prompt_version,
+            model=model,
+            review_window=review_window,
+            defaults={"game_data": game_data},
+        )
+        # 지난 구간의 요약은 삭제
+        GameSummary.objects.filter(
+            app_id=int(app_id), prompt_version=prompt_version, model=model,
+            review_window__lt=review_window,
+        ).delete()
+
+
+def fetch_game_summaries(assistant, app_ids, fetch_timeout=FETCH_TIMEOUT, summary_timeout=SUMMARY_TIMEOUT):
+    """
+    여러 게임의 상세 정보, 리뷰 수집과 LLM 요약을 동시에 진행
+    - 1단계: 모든 게임의 상세 페이지, 긍정/부정 리뷰를 한 번에 요청
+    - 2단계: 수집이 끝난 게임들의 요약을 한 번에 요청
+    단계별 제한 시간을 넘기거나 실패한 게임은 제외하고 {app_id: game_data} 반환
+    """
+    # 1) 상세 정보, 리뷰 수집
+    fetches = [
+        (
+            app_id,
+            _executor.submit(assistant.get_game_info, app_id),
+            _executor.submit(assistant.get_game_review, app_id),
+        )
+        for app_id in app_ids
+    ]
+    deadline = time.monotonic() + fetch_timeout
+
+    summaries = []
+    for app_id, info_future, review_future in fetches:
+        info = _result(info_future, deadline, app_id, "정보 수집")
+        review = _result(review_future, deadline, app_id, "리뷰 수집")
+        if not info or not review:
+            continue
+
+        game_info, game_data = info
+        # 2) LLM 요약 호출
+        summary_future = _executor.submit(assistant.summarychain.invoke, {
+            "short_inform": game_info['short_inform'],
+            "long_inform": game_info['long_inform'],
+            "good_review": review['good_review'],
+            "bad_review": review['bad_review']
+        })
+        summaries.append((app_id, game_data, summary_future))
+    deadline = time.monotonic() + summary_timeout
+
+    game_list = {}
+    for app_id, game_data, summary_future in summaries:
+        game_summary = _result(summary_future, deadline, app_id, "요약")
+        if game_summary:
+            game_data['description'] = game_summary['description']
+            game_data['good_review'] = game_summary['good_review']
+            game_data['bad_review'] = game_summary['bad_review']
+            game_list[app_id] = game_data
+    return game_list
+
+
+def _refresh_summaries(assistant, app_ids):
+    close_old_connections()
+    try:
+        save_summaries(assistant, fetch_game_summaries(assistant, app_ids))
+    except Exception as e:
+        print(f"게임 요약 갱신 실패 ({app_ids}): {e!r}")
+    finally:
+        with _refreshing_lock:
+            _refreshing.difference_update(app_ids)
+        close_old_connections()
+
+
+def schedule_summary_refresh(assistant, app_ids):
+    """
+    오래된 요약 백그라운드 갱신 (이미 갱신 중인 게임은 제외)
+    """
+    with _refreshing_lock:
+        app_ids = [app_id for app_id in app_ids if app_id not in _refreshing]
+        _refreshing.update(app_ids)
+    if app_ids:
+        _refresh_executor.submit(_refresh_summaries, assistant, app_ids)
+
+
+def enrich_games(assistant, app_ids):
+    """
+    추천 게임들의 정보 + 요약 목록 반환 (입력 순서 유지)
+    저장된 요약은 바로 사용하고(오래된 요약은 뒤에서 갱신), 없는 게임만 새로 수집 후 요약
+    """
+    app_ids = [app_id for app_id in app_ids if app_id]
+
+    cached = get_cached_summaries(assistant, app_ids)
+    missing = [app_id for app_id in app_ids if app_id not in cached]
+    stale = [app_id for app_id, (_, fresh) in cached.items() if not fresh]
+
+    game_list = {app_id: game_data for app_id, (game_data, _) in cached.items()}
+    if missing:
+        fetched = fetch_game_summaries(assistant, missing)
+        save_summaries(assistant, fetched)
+        game_list.update(fetched)
+    if stale:
+        schedule_summary_refresh(assistant, stale)
+
+    return [game_list[app_id] for app_id in app_ids if app_id in game_list]
@@ -0,0 +1,243 @@
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+
+
+# 유사 질문이어도 결과를 그대로 재사용할 수 있는 action
+# (search_game은 사용자 입력을 그대로 쓰고, not_supported는 입력을 쓰지 않음)
+SIMILAR_REUSABLE_ACTIONS = ("search_game", "not_supported")
+
+_strip_pattern = re.compile(r"[^\w\s]")
+_space_pattern = re.compile(r"\s+")
+
+# 규칙 기반 의도 분류 패턴
+# 게임 이름은 영어로 입력받으므로, 이름 자리에 영문/숫자가 있을 때만 규칙으로 확정
+_like_pattern = re.compile(
+    r"^(?P<name>.+?)\s*(?:와|과|랑|이랑|하고)?\s*(?:같은|비슷한|유사한)\s*(?:류의\s*)?게임"
+)
+_info_pattern = re.compile(
+    r"^(?P<name>.+?)\s*(?:게임)?\s*(?:에\s*대해서?|에\s*관해서?|정보|설명)\s*(?:좀\s*)?(?:알려|설명|소개|말해)"
+)
+_recommend_pattern = re.compile(r"(?:추천|찾아|뭐\s*있|알려)")
+# 추천 요청처럼 보여도 LLM에 맡길 표현 (방법, 공략 등)
+_ambiguous_pattern = re.compile(r"(?:방법|하는\s*법|공략|설치|오류|환불|가격)")
+_word_pattern = re.compile(r"[A-Za-z0-9]+")
+_hangul_pattern = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+# 규칙 매칭 뒤에 오면 반대 의미가 되는 표현 ("X 같은 게임 말고 ...")
+_negation_pattern = re.compile(r"^\s*(?:은|는)?\s*(?:말고|빼고|아니고|제외하고)")
+
+# 게임 이름이 아닌 영문 장르/특징 약어
+GENRE_WORDS = {
+    "rpg", "jrpg", "arpg", "srpg", "mmorpg", "mmo", "fps", "tps", "rts", "moba",
+    "pvp", "pve", "vr", "2d", "3d", "indie", "co", "op", "aos", "sf", "sns",
+}
+
+
+def normalize_query(query):
+    """
+    질문 정규화 (유니코드 정규화, 소문자, 문장 부호, 공백 제거)
+    띄어쓰기만 다른 질문은 같은 질문으로 취급
+    """
+    query = unicodedata.normalize("NFKC", query or "").lower()
+    query = _strip_pattern.sub("", query)
+    return _space_pattern.sub("", query)
+
+
+def char_ngrams(text, sizes=(2, 3)):
+    """
+    글자 단위 n-gram 빈도 (문장 앞뒤 경계 포함)
+    """
+    text = f"^{text}$"
+    grams = Counter()
+    for n in sizes:
+        for i in range(len(text) - n + 1):
+            grams[text[i:i + n]] += 1
+    return grams
+
+
+def _game_name(name):
+    """
+    규칙으로 추출한 게임 이름 정리
+    - 앞에 붙은 한글 단어("요즘", "혹시", "친구가" 등)는 제거
+    - 남은 이름에 한글이 있거나, 영문/숫자가 없거나, 장르 약어뿐이면 None
+    """
+    name = re.sub(r"\s*게임$", "", name.strip(" \"'“”‘’")).strip()
+    tokens = name.split()
+    while tokens and _hangul_pattern.search(tokens[0]):
+        tokens.pop(0)
+    name = " ".join(tokens).strip(" \"'“”‘’")
+    if _hangul_pattern.search(name):
+        return None
+    words = [word.lower() for word in _word_pattern.findall(name)]
+    if not words or all(word in GENRE_WORDS for word in words):
+        return None
+    return name
+
+
+def classify_by_rules(query):
+    """
+    LLM 호출 전 규칙 기반 의도 분류
+    확실한 경우에만 {"action", "action_output"} 반환, 애매하면 None (LLM으로 넘김)
+    - "X 같은 게임", "X와 비슷한 게임" -> search_like_game ("X 같은 게임 말고 ..."는 LLM으로)
+    - "X에 대해 알려줘" -> search_game_info
+    - 게임 이름 없이 "... 게임 추천해줘", "RPG 추천해줘" -> search_game
+    """
+    query = (query or "").strip()
+    if not query or _ambiguous_pattern.search(query):
+        return None
+
+    match = _like_pattern.search(query)
+    if match:
+        name = _game_name(match.group("name"))
+        if name and not _negation_pattern.search(query[match.end():]):
+            return {"action": "search_like_game", "action_output": name}
+        return None
+
+    match = _info_pattern.search(query)
+    if match:
+        name = _game_name(match.group("name"))
+        if name and not _negation_pattern.search(query[match.end():]):
+            return {"action": "search_game_info", "action_output": name}
+        return None
+
+    if _recommend_pattern.search(query):
+        # 게임 이름을 언급한 추천 요청은 LLM이 판단
+        words = [word.lower() for word in _word_pattern.findall(query)]
+        if all(word in GENRE_WORDS for word in words) and ("게임" in query or words):
+            return {"action": "search_game", "action_output": query}
+    return None
+
+
+class IntentCache:
+    """
+    의도 분류(self.chain) 결과 캐시
+    1) 정규화한 질문이 같으면 그대로 재사용
+    2) 글자 n-gram TF-IDF 코사인 유사도가 기준 이상이면 재사용 (search_game, not_supported 결과만)
+       - 질문 벡터는 저장할 때 한 번만 계산 (IDF는 저장 시점 기준)
+       - n-gram -> 질문 역색인으로 n-gram이 겹치는 질문만 비교
+    """
+
+    def __init__(self, max_size=1000, threshold=0.75):
+        self.max_size = max_size
+        self.threshold = threshold
+        self._entries = OrderedDict()  # {정규화된 질문: (분류 결과, TF-IDF 벡터)}
+        self._df = Counter()  # n-gram 별 등장 질문 수
+        self._postings = {}  # {n-gram: 그 n-gram이 있는 재사용 가능 질문 set}
+        self._lock = threading.Lock()
+        self._stats = Counter()
+
+    def _vector(self, grams):
+        total = len(self._entries) + 1
+        vector = {
+            gram: count * (math.log(total / (1 + self._df[gram])) + 1)
+            for gram, count in grams.items()
+        }
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        return {gram: v / norm for gram, v in vector.items()}
+
+    def _index(self, key, vector):
+        for gram in vector:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def _unindex(self, key, vector):
+        for gram in vector:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def _most_similar(self, grams):
+        query_vector = self._vector(grams)
+        scores = Counter()
+        for gram, weight in query_vector.items():
+            for key in self._postings.get(gram, ()):
+                scores[key] += weight * self._entries[key][1][gram]
+        if not scores:
+            return None, 0.0
+        return scores.most_common(1)[0]
+
+    def get(self, query):
+        """
+        캐시된 분류 결과 반환 (없으면 None)
+        """
+        key = normalize_query(query)
+        if not key:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+                self._stats["exact_hits"] += 1
+                return self._reuse(entry[0], query)
+
+            similar, score = self._most_similar(char_ngrams(key))
+            if similar and score >= self.threshold:
+                self._entries.move_to_end(similar)
+                self._stats["similar_hits"] += 1
+                return self._reuse(self._entries[similar][0], query)
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, query, result):
+        key = normalize_query(query)
+        if not key or not isinstance(result, dict) or "action" not in result:
+            return
+
+        result = dict(result)
+        reusable = result["action"] in SIMILAR_REUSABLE_ACTIONS
+        with self._lock:
+            if key in self._entries:
+                old_result, vector = self._entries[key]
+                self._entries[key] = (result, vector)
+                self._entries.move_to_end(key)
+                if old_result["action"] in SIMILAR_REUSABLE_ACTIONS:
+                    self._unindex(key, vector)
+                if reusable:
+                    self._index(key, vector)
+                return
+
+            grams = char_ngrams(key)
+            self._df.update(grams.keys())
+            vector = self._vector(grams)
+            self._entries[key] = (result, vector)
+            if reusable:
+                self._index(key, vector)
+
+            # 오래된 질문부터 삭제
+            while len(self._entries) > self.max_size:
+                old_key, (_, old_vector) = self._entries.popitem(last=False)
+                self._unindex(old_key, old_vector)
+                self._df.subtract(old_vector.keys())
+                for gram in old_vector:
+                    if self._df[gram] <= 0:
+                        del self._df[gram]
+
+    @staticmethod
+    def _reuse(result, query):
+        result = dict(result)
+        # search_game은 사용자 입력을 변형 없이 사용하므로 현재 질문으로 교체
+        if result["action"] == "search_game":
+            result["action_output"] = query
+        return result
+
+    def metrics(self):
+        """
+        캐시 적중 현황 (정확 일치, 유사 일치, 미스, 적중률)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._entries)
+        lookups = sum(stats.values())
+        hits = stats.get("exact_hits", 0) + stats.get("similar_hits", 0)
+        return {
+            "size": size,
+            "exact_hits": stats.get("exact_hits", 0),
+            "similar_hits": stats.get("similar_hits", 0),
+            "misses": stats.get("misses", 0),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
@@ -28,4 +28,27 @@ class Message(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"[{'User' if self.is_user else 'Bot'}] {self.content[:30]}"
\ No newline at end of file
+        return f"[{'User' if self.is_user else 'Bot'}] {self.content[:30]}"
+
+class GameSummary(models.Model):
+    '''
+    LLM 게임 요약 결과 저장 (게임 설명, 긍정/부정 리뷰 요약)
+    프롬프트 버전, 모델, 리뷰 수집 기간 구간이 같을 때만 재사용
+    '''
+    app_id = models.IntegerField()
+    prompt_version = models.CharField(max_length=40)
+    model = models.CharField(max_length=100)
+    review_window = models.IntegerField()
+    game_data = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["app_id", "prompt_version", "model", "review_window"],
+                name="unique_game_summary",
+            )
+        ]
+
+    def __str__(self):
+        return f"GameSummary #{self.app_id} ({self.model}, {self.review_window})"
@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+
+import httpx
+
+
+# 워커 프로세스 당 한 번만 만들어 재사용하는 챗봇 인스턴스 {클래스: (설정 키, 인스턴스)}
+_assistants = {}
+_stats = {}
+_lock = threading.Lock()
+
+# 모든 챗봇의 ChatOpenAI가 함께 쓰는 HTTP 클라이언트 (커넥션 풀 공유)
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    OpenAI 요청에 사용할 공용 httpx 클라이언트 반환
+    """
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    timeout=httpx.Timeout(60.0, connect=10.0),
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                )
+    return _http_client
+
+
+def _config_key():
+    """
+    챗봇을 다시 만들어야 하는 설정 값 (모델, temperature)
+    """
+    return (
+        os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+        float(os.getenv("TEMPERATURE", "0.0")),
+    )
+
+
+def get_assistant(assistant_class):
+    """
+    챗봇 인스턴스 반환
+    처음 요청되었거나 OPENAI_MODEL, TEMPERATURE 값이 바뀌었을 때만 from_env()로 새로 생성
+    """
+    key = _config_key()
+    entry = _assistants.get(assistant_class)
+    if entry is None or entry[0] != key:
+        with _lock:
+            entry = _assistants.get(assistant_class)
+            if entry is None or entry[0] != key:
+                start = time.perf_counter()
+                assistant = assistant_class.from_env()
+                elapsed = time.perf_counter() - start
+
+                stats = _stats.setdefault(
+                    assistant_class.__name__, {"built": 0, "reused": 0}
+                )
+                stats["built"] += 1
+                stats["build_seconds"] = round(elapsed, 4)
+                stats["model"], stats["temperature"] = key
+                print(
+                    f"{assistant_class.__name__} 생성 ({key[0]}, temperature={key[1]}): {elapsed:.3f}s"
+                )
+
+                _assistants[assistant_class] = (key, assistant)
+                return assistant
+
+    with _lock:
+        _stats[assistant_class.__name__]["reused"] += 1
+    return entry[1]
+
+
+def get_assistant_stats():
+    """
+    챗봇별 생성 횟수, 마지막 생성 시간(초), 재사용 횟수, 의도 분류 캐시 적중 현황
+    (chatbot/stats/ API로 조회)
+    """
+    with _lock:
+        stats = {name: dict(values) for name, values in _stats.items()}
+        assistants = [assistant for _, assistant in _assistants.values()]
+
+    for assistant in assistants:
+        intent_cache = getattr(assistant, "intent_cache", None)
+        if intent_cache is not None:
+            stats[type(assistant).__name__]["intent_cache"] = intent_cache.metrics()
+    return stats
+
@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import Account
+from chatbot.strategy import invalidate_user_count
+
+
+@receiver(post_save, sender=Account)
+def account_created(sender, instance, created, **kwargs):
+    """유저 생성 시 유저 수 캐시 무효화"""
+    if created:
+        transaction.on_commit(invalidate_user_count)
+
+
+@receiver(post_delete, sender=Account)
+def account_deleted(sender, instance, **kwargs):
+    """유저 삭제 시 유저 수 캐시 무효화"""
+    transaction.on_commit(invalidate_user_count)
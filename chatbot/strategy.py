@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from accounts.models import Account
+
+
+# 전체 유저 수 캐시 (유저 생성/삭제 시그널로 무효화)
+USER_COUNT_KEY = "chatbot_account_count"
+USER_COUNT_TIMEOUT = 60 * 60
+
+
+def get_user_count():
+    """
+    캐시된 전체 유저 수 반환 (없으면 DB에서 세고 저장)
+    """
+    user_count = cache.get(USER_COUNT_KEY)
+    if user_count is None:
+        user_count = Account.objects.count()
+        cache.set(USER_COUNT_KEY, user_count, USER_COUNT_TIMEOUT)
+    return user_count
+
+
+def invalidate_user_count():
+    cache.delete(USER_COUNT_KEY)
+
+
+def is_collaborative_available():
+    """
+    협업 필터링을 사용할 만큼 유저가 모였는지 여부
+    """
+    return get_user_count() >= settings.COLLABORATIVE_MIN_USERS
@@ -0,0 +1,230 @@
+import re
+import threading
+import time
+import unicodedata
+
+from accounts.models import Tag
+from accounts.tag_index import GameTagPostings
+
+
+# 태그 사전(name_ko, name_en)에 그대로 나오지 않는 표현 -> 태그 영문 이름
+SYNONYMS = {
+    "힐링": "Relaxing",
+    "편안한": "Relaxing",
+    "잔잔한": "Relaxing",
+    "귀여운": "Cute",
+    "귀엽": "Cute",
+    "농사": "Farming Sim",
+    "농장": "Farming Sim",
+    "물고기": "Fishing",
+    "낚시": "Fishing",
+    "무서운": "Horror",
+    "공포": "Horror",
+    "호러": "Horror",
+    "총싸움": "Shooter",
+    "총게임": "Shooter",
+    "슈팅": "Shooter",
+    "좀비": "Zombies",
+    "친구랑": "Co-op",
+    "친구와": "Co-op",
+    "같이할": "Co-op",
+    "협동": "Co-op",
+    "멀티": "Multiplayer",
+    "오픈월드": "Open World",
+    "생존": "Survival",
+    "서바이벌": "Survival",
+    "로그라이크": "Roguelike",
+    "로그라이트": "Roguelite",
+    "소울라이크": "Souls-like",
+    "메트로배니아": "Metroidvania",
+    "미연시": "Dating Sim",
+    "연애": "Dating Sim",
+    "요리": "Cooking",
+    "카드게임": "Card Game",
+    "덱빌딩": "Deckbuilding",
+    "리듬": "Rhythm",
+    "격투": "Fighting",
+    "잠입": "Stealth",
+    "탐험": "Exploration",
+    "건설": "Building",
+    "경영": "Management",
+    "타이쿤": "Management",
+    "전략": "Strategy",
+    "턴제": "Turn-Based",
+    "퍼즐": "Puzzle",
+    "레이싱": "Racing",
+    "자동차": "Driving",
+    "축구": "Soccer",
+    "우주": "Space",
+    "공상과학": "Sci-fi",
+    "픽셀": "Pixel Graphics",
+    "도트": "Pixel Graphics",
+    "스토리": "Story Rich",
+    "판타지": "Fantasy",
+    "샌드박스": "Sandbox",
+    "경쟁": "Competitive",
+    "추리": "Detective",
+    "탐정": "Detective",
+}
+
+# 태그 매처 재생성 주기 (태그는 crawling 커맨드로만 바뀜)
+MATCHER_TIMEOUT = 60 * 60
+
+# LLM에 넘길 후보 태그 수
+SHORTLIST_SIZE = 40
+
+_matcher = None
+_matcher_expires = 0
+_matcher_lock = threading.Lock()
+
+_strip_pattern = re.compile(r"[\W_]+")
+
+
+def normalize_text(text):
+    """
+    매칭용 문자열 정규화 (소문자, 공백/문장 부호 제거)
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return _strip_pattern.sub("", text)
+
+
+def char_bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class AhoCorasick:
+    """
+    여러 키워드를 입력 문자열에서 한 번에 찾는 Aho–Corasick 오토마타
+    """
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+    def add(self, keyword, value):
+        node = 0
+        for ch in keyword:
+            next_node = self.goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][ch] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = next_node
+        self.output[node].append((len(keyword), value))
+
+    def build(self):
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for ch, child in self.goto[node].items():
+                fail = self.fail[node]
+                while fail and ch not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[child] = self.goto[fail].get(ch, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+                queue.append(child)
+        return self
+
+    def find(self, text):
+        """
+        [(시작 위치, 끝 위치, value), ...]
+        """
+        matches = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for length, value in self.output[node]:
+                matches.append((i - length + 1, i + 1, value))
+        return matches
+
+
+class TagMatcher:
+    """
+    사용자 입력에서 태그(steam_tag_id)를 찾는 로컬 매처
+    태그 한글/영문 이름과 동의어 사전을 키워드로 사용
+    """
+
+    def __init__(self, tags, synonyms=SYNONYMS, popularity=None):
+        self.tags = [tag for tag in tags if tag["steam_tag_id"]]
+        self.popularity = popularity or {}
+
+        by_name_en = {tag["name_en"]: tag["steam_tag_id"] for tag in self.tags}
+        keywords = {}
+        for tag in self.tags:
+            for name in (tag["name_ko"], tag["name_en"]):
+                keyword = normalize_text(name)
+                if len(keyword) >= 2:
+                    keywords.setdefault(keyword, tag["steam_tag_id"])
+        for word, name_en in synonyms.items():
+            if name_en in by_name_en:
+                keywords.setdefault(normalize_text(word), by_name_en[name_en])
+
+        self.automaton = AhoCorasick()
+        for keyword, steam_tag_id in keywords.items():
+            self.automaton.add(keyword, steam_tag_id)
+        self.automaton.build()
+
+        self.bigrams = [
+            (char_bigrams(normalize_text(tag["name_ko"])), tag) for tag in self.tags
+        ]
+
+    def match(self, query, limit=3):
+        """
+        입력에 등장하는 태그를 앞에서부터 최대 limit개 반환 (겹치는 키워드는 긴 것 우선)
+        """
+        matches = sorted(
+            self.automaton.find(normalize_text(query)),
+            key=lambda x: (x[0], -(x[1] - x[0])),
+        )
+
+        tag_ids = []
+        end = 0
+        for start, stop, steam_tag_id in matches:
+            if start < end:
+                continue
+            end = stop
+            if steam_tag_id not in tag_ids:
+                tag_ids.append(steam_tag_id)
+            if len(tag_ids) == limit:
+                break
+        return tag_ids
+
+    def shortlist(self, query, size=SHORTLIST_SIZE):
+        """
+        LLM에 넘길 후보 태그 목록
+        입력과 글자가 겹치는 태그를 우선하고, 나머지는 게임 수가 많은 태그로 채움
+        """
+        query_bigrams = char_bigrams(normalize_text(query))
+        ranked = sorted(
+            self.bigrams,
+            key=lambda x: (
+                -len(x[0] & query_bigrams),
+                -self.popularity.get(x[1]["steam_tag_id"], 0),
+            ),
+        )
+        return [
+            {"name_ko": tag["name_ko"], "steam_tag_id": tag["steam_tag_id"]}
+            for _, tag in ranked[:size]
+        ]
+
+
+def get_tag_matcher():
+    """
+    프로세스 공용 태그 매처 반환 (일정 시간마다 태그 테이블로 다시 생성)
+    """
+    global _matcher, _matcher_expires
+    now = time.monotonic()
+    if _matcher is None or _matcher_expires <= now:
+        with _matcher_lock:
+            if _matcher is None or _matcher_expires <= now:
+                postings = GameTagPostings.get().postings
+                _matcher = TagMatcher(
+                    list(Tag.objects.values("name_ko", "name_en", "steam_tag_id")),
+                    popularity={tag_id: len(p) for tag_id, p in postings.items()},
+                )
+                _matcher_expires = now + MATCHER_TIMEOUT
+    return _matcher
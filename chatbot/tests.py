@@ -1,3 +1,99 @@
-from django.test import TestCase
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from chatbot.assistant import Assistant
+from chatbot.intent import IntentCache, classify_by_rules
+
+
+# (사용자 입력, 기대 action, 기대 action_output) - agent_prompt 규칙 기준 정답
+LABELED_QUERIES = [
+    ("Palworld 같은 게임 추천해줘", "search_like_game", "Palworld"),
+    ("gta와 비슷한 게임 추천해줘", "search_like_game", "gta"),
+    ("Stardew Valley랑 비슷한 게임 있어?", "search_like_game", "Stardew Valley"),
+    ("Hollow Knight과 유사한 게임 찾아줘", "search_like_game", "Hollow Knight"),
+    ("Terraria 같은 게임", "search_like_game", "Terraria"),
+    ("Stardew Valley에 대해 알려줘", "search_game_info", "Stardew Valley"),
+    ("GTA 게임에 대해 알려줘", "search_game_info", "GTA"),
+    ("Elden Ring에 대해서 설명해줘", "search_game_info", "Elden Ring"),
+    ("Minecraft 정보 알려줘", "search_game_info", "Minecraft"),
+    ("Hades에 관해 알려줘", "search_game_info", "Hades"),
+    ("RPG 추천해줘", "search_game", "RPG 추천해줘"),
+    ("힐링 게임 추천해줘", "search_game", "힐링 게임 추천해줘"),
+    ("귀여운 동물 나오는 힐링 게임 뭐 있어?", "search_game", "귀여운 동물 나오는 힐링 게임 뭐 있어?"),
+    ("FPS 게임 추천 좀", "search_game", "FPS 게임 추천 좀"),
+    ("친구랑 같이 할 수 있는 협동 게임 찾아줘", "search_game", "친구랑 같이 할 수 있는 협동 게임 찾아줘"),
+    ("공포 게임 알려줘", "search_game", "공포 게임 알려줘"),
+    ("어쌔신 크리드 오디세이에 대해 알려줘", "search_game_info", "어쌔신 크리드 오디세이"),
+    ("Hades랑 비슷한 로그라이크 게임", "search_like_game", "Hades"),
+    ("요즘 Stardew Valley 같은 게임 뭐 있어?", "search_like_game", "Stardew Valley"),
+    ("혹시 Hades에 대해 알려줄래?", "search_game_info", "Hades"),
+    ("친구가 Terraria 같은 게임 추천해달래", "search_like_game", "Terraria"),
+    ("Minecraft 같은 게임 말고 RPG 추천해줘", "search_game", "Minecraft 같은 게임 말고 RPG 추천해줘"),
+    ("Terraria 같은 게임 빼고 다른 거 추천해줘", "search_game", "Terraria 같은 게임 빼고 다른 거 추천해줘"),
+    ("Elden Ring 추천해줘", "not_supported", ""),
+    ("파스타 레시피 알려줘", "not_supported", ""),
+    ("맛집 추천해줘", "not_supported", ""),
+    ("오늘 날씨 어때", "not_supported", ""),
+    ("게임 설치 방법 알려줘", "not_supported", ""),
+]
+
+
+class RuleIntentTest(SimpleTestCase):
+    """규칙 기반 의도 분류 테스트"""
+
+    def test_rules_agree_with_labels(self):
+        """규칙으로 분류한 질문은 모두 정답과 일치해야 함"""
+        resolved = 0
+        for query, action, action_output in LABELED_QUERIES:
+            result = classify_by_rules(query)
+            if result is None:
+                continue
+            resolved += 1
+            self.assertEqual(
+                (result["action"], result["action_output"]),
+                (action, action_output),
+                query,
+            )
+
+        # 절반 이상의 질문은 LLM 호출 없이 처리
+        self.assertGreaterEqual(resolved / len(LABELED_QUERIES), 0.5)
+
+    def test_unsupported_queries_fall_through(self):
+        """게임과 무관한 질문은 규칙으로 판단하지 않고 LLM으로 넘김"""
+        for query, action, _ in LABELED_QUERIES:
+            if action == "not_supported":
+                self.assertIsNone(classify_by_rules(query), query)
+
+    def test_negated_queries_fall_through(self):
+        """"X 같은 게임 말고/빼고 ..."는 규칙으로 판단하지 않고 LLM으로 넘김"""
+        for query in (
+            "Minecraft 같은 게임 말고 RPG 추천해줘",
+            "Terraria 같은 게임 빼고 다른 거 추천해줘",
+            "Hades 같은 게임 아니고 퍼즐 게임 추천해줘",
+        ):
+            self.assertIsNone(classify_by_rules(query), query)
+
+    def test_rule_matches_skip_llm_chain(self):
+        """규칙으로 분류되는 질문은 LLM 체인을 호출하지 않고, 나머지만 호출"""
+        assistant = Assistant.__new__(Assistant)
+        assistant.config = SimpleNamespace(not_supported_message="", not_result_message="")
+        assistant.intent_cache = IntentCache()
+        assistant.chain = mock.Mock()
+        assistant.chain.invoke.return_value = {"action": "not_supported", "action_output": ""}
+
+        with mock.patch.object(Assistant, "search_game", return_value={}) as search_game, \
+                mock.patch.object(Assistant, "search_game_info", return_value={}) as search_game_info, \
+                mock.patch.object(Assistant, "search_like_game", return_value={}) as search_like_game:
+            resolved = 0
+            for query, _, _ in LABELED_QUERIES:
+                if classify_by_rules(query) is not None:
+                    assistant.process_query(None, query)
+                    resolved += 1
+            assistant.chain.invoke.assert_not_called()
+            handled = search_game.call_count + search_game_info.call_count + search_like_game.call_count
+            self.assertEqual(handled, resolved)
+
+            assistant.process_query(None, "파스타 레시피 알려줘")
+            assistant.chain.invoke.assert_called_once_with({"input": "파스타 레시피 알려줘"})
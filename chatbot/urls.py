@@ -12,4 +12,6 @@ urlpatterns = [
     path("<int:messageid>/", views.DeleteChatbotRecordAPIView.as_view(), name="delete_record"),
     # 자동 사용자 맞춤 게임 추천
     path("auto/", views.AutoChatbotAPIView.as_view(), name="auto_chatbot"),
+    # 챗봇 인스턴스/의도 분류 캐시 현황 (관리자 전용)
+    path("stats/", views.ChatbotStatsAPIView.as_view(), name="chatbot_stats"),
 ]
@@ -7,9 +7,10 @@ from chatbot.serializers import MessageSerializer
 from chatbot.assistant import Assistant
 from chatbot.collaborate import Collaborations_Assistant
 from chatbot.autoquest import AutoAssistant
+from chatbot.registry import get_assistant, get_assistant_stats
+from chatbot.strategy import is_collaborative_available
 from django.shortcuts import get_object_or_404
-from rest_framework.permissions import IsAuthenticated
-from accounts.models import Account
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 
 class ChatbotRecordAPIView(APIView):
     """
@@ -79,7 +80,6 @@ class ChatbotAPIView(APIView):
         챗봇 응답 요청 및 대화 내역 저장
         """
         message = request.data.get("message", "")
-        user_count = Account.objects.count()
 
         # 1) Conversation 객체 가져오기
         conversation = Conversation.objects.filter(account_id=request.user.id).first()
@@ -97,14 +97,14 @@ class ChatbotAPIView(APIView):
         user_serializer = MessageSerializer(data=user_message)
 
         # 3) 챗봇 응답 메시지 저장
-        # 3-1) 챗봇 모델 생성
+        # 3-1) 챗봇 모델 가져오기 (프로세스 당 한 번만 생성)
         # 유저 수에 따라 방법 달라짐 (하이브리드 필터링)
-        if user_count >= 30:
-            # 유저 30명 이상 : 협업 필터링
-            assistant = Collaborations_Assistant.from_env()
+        if is_collaborative_available():
+            # 유저 수 기준 이상 : 협업 필터링
+            assistant = get_assistant(Collaborations_Assistant)
         else:
-            # 유저 30명 미만 : 콘텐츠 기반 필터링
-            assistant = Assistant.from_env()
+            # 유저 수 기준 미만 : 콘텐츠 기반 필터링
+            assistant = get_assistant(Assistant)
 
         bot_message = {
             "conversation": conversation.id,
@@ -220,8 +220,8 @@ class AutoChatbotAPIView(APIView):
         user_serializer = MessageSerializer(data=user_message)
 
         # 3) 챗봇 응답 메시지 저장
-        # 3-1) 챗봇 모델 생성
-        assistant = AutoAssistant.from_env()
+        # 3-1) 챗봇 모델 가져오기 (프로세스 당 한 번만 생성)
+        assistant = get_assistant(AutoAssistant)
 
         bot_message = {
             "conversation": conversation.id,
@@ -247,3 +247,14 @@ class AutoChatbotAPIView(APIView):
             'user_message': user_message['content'],
             'bot_message': bot_message['content']
         }, status=status.HTTP_201_CREATED)
+
+
+class ChatbotStatsAPIView(APIView):
+    """
+    챗봇 인스턴스 생성/재사용 횟수와 의도 분류 캐시 적중 현황 조회 API (관리자 전용)
+    현재 요청을 처리한 워커 프로세스의 값만 반환
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_assistant_stats(), status=status.HTTP_200_OK)
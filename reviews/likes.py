@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.db.models import F
+
+from .models import Review, ReviewComment, ReviewCommentLike, ReviewLike
+
+
+def counter_changes(old, new):
+    """
+    is_active 변경(old -> new)에 따른 추천/비추천 수 변경값 (F() 식, 변경 없는 필드는 제외)
+    """
+    changes = {}
+    likes = (new == 1) - (old == 1)
+    dislikes = (new == -1) - (old == -1)
+    if likes:
+        changes["total_likes"] = F("total_likes") + likes
+    if dislikes:
+        changes["total_dislikes"] = F("total_dislikes") + dislikes
+    return changes
+
+
+def _set_like(like_model, target_model, target_field, user, target, is_active):
+    with transaction.atomic():
+        # 같은 유저의 동시 요청이 서로의 변경을 덮어쓰지 않도록 좋아요 행을 잠그고 처리
+        like, created = like_model.objects.select_for_update().get_or_create(
+            user=user, **{target_field: target}, defaults={"is_active": 0}
+        )
+        old = like.is_active
+        if old != is_active or created:
+            like.is_active = is_active
+            like.save()
+
+        changes = counter_changes(old, is_active)
+        if changes:
+            target_model.objects.filter(pk=target.pk).update(**changes)
+    return like, created
+
+
+def set_review_like(user, review, is_active):
+    """
+    리뷰 좋아요/비추천 저장 및 Review 추천/비추천 수 갱신 -> (ReviewLike, 새로 생성 여부)
+    """
+    return _set_like(ReviewLike, Review, "review", user, review, is_active)
+
+
+def set_comment_like(user, comment, is_active):
+    """
+    댓글 좋아요/비추천 저장 및 ReviewComment 추천/비추천 수 갱신 -> (ReviewCommentLike, 새로 생성 여부)
+    """
+    return _set_like(ReviewCommentLike, ReviewComment, "comment", user, comment, is_active)
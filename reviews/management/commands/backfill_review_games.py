@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from accounts.models import Game
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = "리뷰에 저장된 게임 이름/헤더 이미지를 Game 데이터로 채우거나 갱신합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true",
+            help="게임 정보가 비어 있는 리뷰뿐 아니라 모든 리뷰를 Game 데이터와 맞춤",
+        )
+
+    def handle(self, *args, **options):
+        games = Game.objects.filter(appID=OuterRef("app_id"))
+        reviews = Review.objects.all()
+        if not options["all"]:
+            reviews = reviews.filter(Q(game_name="") | Q(header_image__isnull=True))
+
+        # UPDATE 한 번으로 처리 (Game에 없는 app_id는 빈 값)
+        updated = reviews.update(
+            game_name=Coalesce(Subquery(games.values("name")[:1]), Value("")),
+            header_image=Subquery(games.values("header_image")[:1]),
+        )
+        self.stdout.write(self.style.SUCCESS(f"리뷰 {updated}개의 게임 정보를 갱신했습니다."))
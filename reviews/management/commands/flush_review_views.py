@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from reviews.view_counter import flush_review_views
+
+
+class Command(BaseCommand):
+    help = "ReviewViewBuffer에 쌓인 리뷰 조회수를 Review.view_count에 반영합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=60.0, help="반영 주기(초)")
+        parser.add_argument("--once", action="store_true", help="쌓인 조회수만 반영하고 종료")
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            flushed = 0
+            while True:
+                count = flush_review_views()
+                if not count:
+                    break
+                flushed += count
+            if flushed:
+                self.stdout.write(f"리뷰 {flushed}개의 조회수 반영")
+
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS("리뷰 조회수 반영 완료."))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from reviews.models import Review, ReviewComment, ReviewCommentLike, ReviewLike
+
+
+def count_subquery(like_model, target_field, is_active):
+    """
+    좋아요 테이블에서 대상(리뷰/댓글)별 is_active 개수를 세는 서브쿼리
+    """
+    counts = (
+        like_model.objects.filter(**{target_field: OuterRef("pk"), "is_active": is_active})
+        .order_by()
+        .values(target_field)
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def repair(target_model, like_model, target_field):
+    """
+    저장된 추천/비추천 수가 실제 좋아요 기록과 다른 행만 다시 계산 -> 수정한 행 수
+    """
+    likes = count_subquery(like_model, target_field, 1)
+    dislikes = count_subquery(like_model, target_field, -1)
+    with transaction.atomic():
+        mismatched = target_model.objects.annotate(
+            actual_likes=likes, actual_dislikes=dislikes
+        ).filter(
+            ~Q(total_likes=F("actual_likes")) | ~Q(total_dislikes=F("actual_dislikes"))
+        )
+        return target_model.objects.filter(
+            pk__in=list(mismatched.values_list("pk", flat=True))
+        ).update(total_likes=likes, total_dislikes=dislikes)
+
+
+class Command(BaseCommand):
+    help = "리뷰/댓글의 추천·비추천 수를 좋아요 기록으로 다시 계산합니다."
+
+    def handle(self, *args, **options):
+        reviews = repair(Review, ReviewLike, "review")
+        comments = repair(ReviewComment, ReviewCommentLike, "comment")
+        self.stdout.write(
+            self.style.SUCCESS(f"추천 수 수정 완료. (리뷰 {reviews}개, 댓글 {comments}개)")
+        )
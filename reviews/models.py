@@ -2,9 +2,39 @@ from django.db import models
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.db.models import Prefetch
 from accounts.models import Game
 
 
+def counter_safe_update_fields(instance, update_fields, counter_fields):
+    """
+    이미 저장된 객체를 save()할 때 저장할 필드 (카운터 필드 제외)
+    카운터(조회수, 추천 수)는 F() UPDATE로만 바꾸므로, 수정 요청이 읽어 둔 옛 값으로 덮어쓰지 않게 함
+    """
+    if update_fields is not None:
+        return update_fields
+    return [
+        field.name
+        for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name not in counter_fields
+    ]
+
+
+class ReviewQuerySet(models.QuerySet):
+    def with_details(self):
+        """
+        ReviewSerializer에 필요한 데이터를 한 번에 조회
+        작성자(select_related), 댓글과 댓글 작성자(Prefetch)
+        -> 리뷰 수와 상관없이 쿼리 수 일정
+        """
+        return self.select_related("user").prefetch_related(
+            Prefetch(
+                "comments",
+                queryset=ReviewComment.objects.select_related("user"),
+            )
+        )
+
+
 class Review(models.Model):
     """Review 모델 설정"""
 
@@ -30,53 +60,72 @@ class Review(models.Model):
         models.CharField(max_length=50), default=list, blank=True
     )  # 리뷰 카테고리
     view_count = models.PositiveIntegerField(default=0)  # 조회수
+    total_likes = models.PositiveIntegerField(default=0)  # 추천 수 (ReviewLike 변경 시 갱신)
+    total_dislikes = models.PositiveIntegerField(default=0)  # 비추천 수
     created_at = models.DateTimeField(auto_now_add=True)  # 리뷰 생성 시간
     updated_at = models.DateTimeField(auto_now=True)  # 리뷰 수정 시간
 
+    objects = ReviewQuerySet.as_manager()
+
+    # 게임 정보 (목록 조회 때 리뷰마다 Game을 조회하지 않도록 저장해 둠)
+    game_name = models.CharField(max_length=255, blank=True, default="")
+    header_image = models.URLField(max_length=500, blank=True, null=True)
+
+    # F() UPDATE로만 바뀌는 필드 (좋아요: reviews.likes, 조회수: reviews.view_counter)
+    COUNTER_FIELDS = ("view_count", "total_likes", "total_dislikes")
+
     def save(self, *args, **kwargs):
-        """저장 시 app_id가 변경되면 categories 업데이트"""
+        """저장 시 app_id가 변경되면 categories, 게임 정보 업데이트"""
         # 기존 app_id 확인
         original_app_id = None
         if self.pk:  # 기존에 저장된 객체라면
-            original_app_id = Review.objects.get(pk=self.pk).app_id
-
-        # app_id가 변경된 경우
-        if original_app_id != self.app_id:
+            original_app_id = (
+                Review.objects.filter(pk=self.pk).values_list("app_id", flat=True).first()
+            )
+        if not self._state.adding:
+            # 수정 시 카운터 필드는 저장하지 않음 (app_id를 바꾸면 게임 정보도 함께 저장)
+            update_fields = counter_safe_update_fields(
+                self, kwargs.get("update_fields"), self.COUNTER_FIELDS
+            )
+            if "app_id" in update_fields:
+                update_fields = {*update_fields, "categories", "game_name", "header_image"}
+            kwargs["update_fields"] = update_fields
+
+        # app_id가 변경되었거나 게임 정보가 비어 있는 경우
+        if original_app_id != self.app_id or not self.game_name:
             game = Game.objects.filter(appID=self.app_id).first()
             if game:
-                self.categories = (
-                    game.genres
-                )  # 새로운 app_id에 따른 categories 업데이트
+                if original_app_id != self.app_id:
+                    self.categories = (
+                        game.genres
+                    )  # 새로운 app_id에 따른 categories 업데이트
+                self.game_name = game.name
+                self.header_image = game.header_image
+            else:
+                self.game_name = ""
+                self.header_image = None
 
         super().save(*args, **kwargs)
 
     @property
     def game(self):
         """app_id를 기반으로 Game 객체 반환"""
-        from accounts.models import Game  # Game 모델 임포트
-
         return Game.objects.filter(appID=self.app_id).first()
 
-    @property
-    def game_name(self):
-        """Game 이름 반환"""
-        return self.game.name if self.game else "Unknown Game"
-
-    @property
-    def header_image(self):
-        """Game 헤더 이미지 반환"""
-        return self.game.header_image if self.game else None
-
     def __str__(self):
         if self.user:
             nickname = self.user.nickname
         else:
             nickname = "알수없음"
 
-        return f"Review 작성자 : {nickname} - 스팀 게임 번호 : {self.app_id} - 게임 이름 : {self.game.name} - 평점 : ({self.score})"
+        return f"Review 작성자 : {nickname} - 스팀 게임 번호 : {self.app_id} - 게임 이름 : {self.game_name or 'Unknown Game'} - 평점 : ({self.score})"
 
     class Meta:
         ordering = ["-created_at"]  # 최신순 정렬
+        indexes = [
+            # 인기순 정렬용
+            models.Index(fields=["-total_likes", "-created_at"], name="review_popular_idx"),
+        ]
 
 
 class ReviewComment(models.Model):
@@ -94,9 +143,22 @@ class ReviewComment(models.Model):
     )
 
     content = models.TextField()  # 댓글 내용
+    total_likes = models.PositiveIntegerField(default=0)  # 추천 수 (ReviewCommentLike 변경 시 갱신)
+    total_dislikes = models.PositiveIntegerField(default=0)  # 비추천 수
     created_at = models.DateTimeField(auto_now_add=True)  # 댓글 생성 시간
     updated_at = models.DateTimeField(auto_now=True)  # 댓글 수정 시간
 
+    # F() UPDATE로만 바뀌는 필드 (reviews.likes)
+    COUNTER_FIELDS = ("total_likes", "total_dislikes")
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            # 수정 시 카운터 필드는 저장하지 않음
+            kwargs["update_fields"] = counter_safe_update_fields(
+                self, kwargs.get("update_fields"), self.COUNTER_FIELDS
+            )
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Comment by {self.user.nickname if self.user else '알수없음'} on Review {self.review.id}"
 
@@ -153,3 +215,23 @@ class ReviewCommentLike(models.Model):
 
     class Meta:
         unique_together = ("user", "comment")  # 유저-댓글 조합 중복 방지
+
+
+class ReviewViewBuffer(models.Model):
+    """
+    아직 Review.view_count에 반영되지 않은 조회수 (flush_review_views가 반영 후 삭제)
+    인기 리뷰의 조회가 한 행에 몰리지 않도록 shard 별로 나눠서 증가
+    """
+
+    review = models.ForeignKey(
+        Review,
+        on_delete=models.CASCADE,  # 리뷰가 삭제되면 쌓인 조회수도 삭제
+        related_name="view_buffers",
+    )
+    shard = models.PositiveSmallIntegerField(default=0)
+    count = models.PositiveIntegerField(default=0)  # 쌓인 조회수
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["review", "shard"], name="unique_review_view_shard")
+        ]
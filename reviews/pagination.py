@@ -0,0 +1,91 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+from django.db.models import Q
+
+
+# 페이지당 항목 수
+PAGE_SIZE = 10
+
+
+class InvalidPage(ValueError):
+    """잘못된 cursor 또는 page 값"""
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    number: int  # 현재 페이지 번호 (기존 current_page 응답과 호환)
+    has_next: bool
+    next_cursor: Optional[str]
+
+
+def encode_cursor(values, number):
+    """
+    마지막 항목의 정렬 키 값과 페이지 번호 -> URL에 넣을 수 있는 cursor 문자열
+    (datetime은 str()로 저장 -> 마이크로초까지 유지)
+    """
+    payload = json.dumps({"k": values, "p": number}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, key_count):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values, number = payload["k"], int(payload["p"])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise InvalidPage("잘못된 cursor 값입니다.")
+    if not isinstance(values, list) or len(values) != key_count or number < 1:
+        raise InvalidPage("잘못된 cursor 값입니다.")
+    return values, number
+
+
+def after_filter(ordering, values):
+    """
+    (정렬 키 값들)보다 뒤에 오는 행 조건
+    (a, b, id) 정렬이면 a 다음 OR (a 같고 b 다음) OR (a, b 같고 id 다음)
+    """
+    condition = Q()
+    for i, (field, descending) in enumerate(ordering):
+        lookup = f"{field}__lt" if descending else f"{field}__gt"
+        equal = {prev_field: value for (prev_field, _), value in zip(ordering[:i], values)}
+        condition |= Q(**equal, **{lookup: values[i]})
+    return condition
+
+
+def paginate_keyset(queryset, ordering, cursor=None, page=None, page_size=PAGE_SIZE):
+    """
+    정렬 키 기준 keyset 페이지네이션 (COUNT 쿼리 없이 page_size + 1개만 조회)
+    - ordering: [(필드 이름, 내림차순 여부), ...] 마지막은 유일한 값(id 등)이어야 함
+    - cursor가 있으면 cursor 다음부터, 없으면 page 번호로 조회 (기존 page 파라미터 호환)
+    """
+    if cursor:
+        values, number = decode_cursor(cursor, len(ordering))
+        queryset = queryset.filter(after_filter(ordering, values))
+        offset = 0
+        number += 1
+    else:
+        try:
+            number = int(page or 1)
+        except (TypeError, ValueError):
+            number = 0
+        if number < 1:
+            raise InvalidPage("page는 1 이상의 정수여야 합니다.")
+        offset = (number - 1) * page_size
+
+    queryset = queryset.order_by(
+        *[f"-{field}" if descending else field for field, descending in ordering]
+    )
+    rows = list(queryset[offset:offset + page_size + 1])
+    has_next = len(rows) > page_size
+    items = rows[:page_size]
+
+    next_cursor = None
+    if has_next:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, field) for field, _ in ordering], number)
+    return KeysetPage(items, number, has_next, next_cursor)
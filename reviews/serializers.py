@@ -16,10 +16,19 @@ class ReviewCommentSerializer(serializers.ModelSerializer):
             "user",
             "nickname",
             "content",
+            "total_likes",
+            "total_dislikes",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "id",
+            "review",
+            "total_likes",
+            "total_dislikes",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "review", "created_at", "updated_at"]
 
     def get_nickname(self, obj):
         """유저 닉네임 반환 (유저가 없으면 '알수없음')"""
@@ -72,9 +81,9 @@ class ReviewSerializer(serializers.ModelSerializer):
     nickname = serializers.SerializerMethodField()  # 사용자 닉네임 반환
     content_display = serializers.SerializerMethodField()  # 차단된 사용자 콘텐츠 처리
     comments = ReviewCommentSerializer(many=True, read_only=True)  # 연결된 댓글들
-    total_likes = serializers.IntegerField(read_only=True)  # annotate로 계산된 값
-    total_dislikes = serializers.IntegerField(read_only=True)  # annotate로 계산된 값
-    game_name = serializers.CharField(read_only=True)
+    total_likes = serializers.IntegerField(read_only=True)  # 좋아요 변경 시 갱신되는 값
+    total_dislikes = serializers.IntegerField(read_only=True)  # 좋아요 변경 시 갱신되는 값
+    game_name = serializers.SerializerMethodField()  # 리뷰에 저장된 게임 이름
     header_image = serializers.CharField(read_only=True)
 
     class Meta:
@@ -139,6 +148,10 @@ class ReviewSerializer(serializers.ModelSerializer):
         """유저 닉네임 반환 (유저가 없으면 '알수없음')"""
         return obj.user.nickname if obj.user else "알수없음"
 
+    def get_game_name(self, obj):
+        """게임 이름 반환 (게임 정보가 없으면 'Unknown Game')"""
+        return obj.game_name or "Unknown Game"
+
     def get_content_display(self, obj):
         blocked_users = self.context.get("blocked_users", [])
         if obj.user and obj.user.id in blocked_users:
@@ -1,8 +1,13 @@
+from django.core.cache import caches
+from django.db.models import F
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
-from .models import Review
-from accounts.models import Game
+from .likes import set_review_like
+from .view_counter import flush_review_views
+from .models import Review, ReviewComment, ReviewViewBuffer
+from accounts.models import Account, Game
 
 class ReviewSearchAPITest(APITestCase):
     """ReviewSearchAPIView 테스트"""
@@ -103,4 +108,133 @@ class ReviewSearchAPITest(APITestCase):
         url = reverse('reviews:review_search')
         response = self.client.get(url, {'keyword': 'game'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)  # 3개의 리뷰가 매칭됨
+        self.assertEqual(len(response.data["reviews"]), 3)  # 3개의 리뷰가 매칭됨
+
+
+class ReviewListQueryCountTest(APITestCase):
+    """리뷰 목록/검색 API 쿼리 수 테스트 (리뷰, 댓글 수와 상관없이 일정해야 함)"""
+
+    # 리뷰 페이지, 댓글(+작성자) prefetch (COUNT 쿼리 없음)
+    QUERY_BUDGET = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Account.objects.create_user(
+            "writer", "writer@example.com", "password", "작성자", 20
+        )
+        cls.game = Game.objects.create(
+            appID=201, name="Query Game", genres=["RPG"],
+            header_image="http://example.com/query.jpg",
+        )
+
+    def create_reviews(self, count):
+        for i in range(count):
+            review = Review.objects.create(
+                user=self.user, content=f"query review {i}", app_id=201
+            )
+            for j in range(3):
+                ReviewComment.objects.create(
+                    review=review, user=self.user, content=f"comment {j}"
+                )
+            set_review_like(self.user, review, 1)
+
+    def test_review_list_query_count(self):
+        url = reverse("reviews:review_list")
+        for count in (2, 10):
+            Review.objects.all().delete()
+            self.create_reviews(count)
+            with self.assertNumQueries(self.QUERY_BUDGET):
+                response = self.client.get(url)
+            self.assertEqual(len(response.data["reviews"]), count)
+            self.assertEqual(response.data["reviews"][0]["total_likes"], 1)
+            self.assertEqual(len(response.data["reviews"][0]["comments"]), 3)
+
+    def test_review_search_query_count(self):
+        url = reverse("reviews:review_search")
+        for count in (2, 10):
+            Review.objects.all().delete()
+            self.create_reviews(count)
+            with self.assertNumQueries(self.QUERY_BUDGET):
+                response = self.client.get(url, {"keyword": "query"})
+            self.assertEqual(len(response.data["reviews"]), count)
+
+    def test_review_list_cursor_pagination(self):
+        """next_cursor로 끝까지 조회하면 중복/누락 없이 모든 리뷰를 순서대로 반환"""
+        self.create_reviews(25)
+        url = reverse("reviews:review_list")
+        seen, pages, params = [], [], {"sort_by": "popular"}
+        while True:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen += [review["id"] for review in response.data["reviews"]]
+            pages.append(response.data["current_page"])
+            if not response.data["has_next"]:
+                break
+            params["cursor"] = response.data["next_cursor"]
+
+        expected = list(
+            Review.objects.order_by("-total_likes", "-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, [1, 2, 3])
+        # 기존 page 파라미터도 같은 결과
+        response = self.client.get(url, {"sort_by": "popular", "page": 2})
+        self.assertEqual([review["id"] for review in response.data["reviews"]], expected[10:20])
+
+
+class ReviewCounterSaveTest(APITestCase):
+    """리뷰 수정이 그 사이에 바뀐 추천 수/조회수를 덮어쓰지 않는지 테스트"""
+
+    def test_edit_keeps_counters(self):
+        user = Account.objects.create_user("editor", "editor@example.com", "password", "수정자", 20)
+        review = Review.objects.create(user=user, content="before", app_id=401)
+        stale = Review.objects.get(pk=review.pk)  # 수정 요청이 읽어 둔 객체
+
+        set_review_like(user, review, 1)
+        Review.objects.filter(pk=review.pk).update(view_count=F("view_count") + 3)
+
+        stale.content = "after"
+        stale.save()
+        review.refresh_from_db()
+        self.assertEqual(
+            (review.content, review.total_likes, review.view_count), ("after", 1, 3)
+        )
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "review_views": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+)
+class ReviewViewCountTest(APITestCase):
+    """리뷰 조회수: 같은 사용자 반복 조회는 한 번만, 반영은 flush 때 한 번에"""
+
+    def setUp(self):
+        caches["review_views"].clear()
+        self.user = Account.objects.create_user(
+            "viewer", "viewer@example.com", "password", "조회자", 20
+        )
+        self.review = Review.objects.create(content="view review", app_id=301)
+
+    def test_views_are_deduplicated_and_flushed(self):
+        url = reverse("reviews:review_detail", args=[self.review.id])
+        for _ in range(3):
+            self.client.get(url)  # 비로그인 (같은 IP/User-Agent)
+        self.client.force_authenticate(self.user)
+        for _ in range(2):
+            self.client.get(url)
+
+        # 조회 요청 중에는 Review 행에 쓰지 않음
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.view_count, 0)
+
+        self.assertEqual(flush_review_views(), 1)
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.view_count, 2)
+        self.assertFalse(ReviewViewBuffer.objects.exists())
+
+        # 이미 반영한 조회수는 다시 반영하지 않음
+        self.assertEqual(flush_review_views(), 0)
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.view_count, 2)
@@ -0,0 +1,100 @@
+import hashlib
+import random
+from collections import Counter
+
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, PositiveIntegerField, When
+
+from .models import Review, ReviewViewBuffer
+
+
+# 같은 사용자(세션)의 반복 조회를 한 번으로 세는 시간 (초)
+VIEW_DEDUP_TIMEOUT = 60 * 30
+
+# 리뷰 당 조회수 누적 행 수 (같은 리뷰 동시 조회 시 행 잠금 분산)
+BUFFER_SHARDS = 8
+
+# 누적 행 증가/생성 재시도 횟수
+RECORD_ATTEMPTS = 5
+
+# 한 번에 반영할 누적 행 수
+FLUSH_BATCH_SIZE = 1000
+
+
+def get_dedup_cache():
+    """
+    중복 조회 확인용 캐시 (settings.CACHES["review_views"])
+    공용 default 캐시에 사용자별 키를 쌓지 않도록 따로 둠
+    """
+    return caches["review_views"]
+
+
+def get_viewer_key(request):
+    """
+    조회수 중복 제거용 사용자 식별값 (로그인 유저 id -> 세션 -> IP + User-Agent)
+    """
+    if request.user.is_authenticated:
+        return f"user:{request.user.id}"
+    session = getattr(request, "session", None)
+    if session is not None and session.session_key:
+        return f"session:{session.session_key}"
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    ip = forwarded.split(",")[0].strip() or request.META.get("REMOTE_ADDR", "")
+    agent = request.META.get("HTTP_USER_AGENT", "")
+    return "anon:" + hashlib.sha1(f"{ip}|{agent}".encode("utf-8")).hexdigest()
+
+
+def record_view(review_id, viewer_key):
+    """
+    리뷰 조회 기록 - Review 행은 건드리지 않고 ReviewViewBuffer의 shard 하나만 F()로 증가
+    같은 사용자가 VIEW_DEDUP_TIMEOUT 안에 다시 조회하면 세지 않음 -> 센 경우 True
+    """
+    if not get_dedup_cache().add(f"seen:{review_id}:{viewer_key}", 1, VIEW_DEDUP_TIMEOUT):
+        return False
+
+    shard = random.randrange(BUFFER_SHARDS)
+    buffers = ReviewViewBuffer.objects.filter(review_id=review_id, shard=shard)
+    # 행이 있으면 증가, 없으면 생성 (동시에 생성되었거나 반영 작업이 그 사이 삭제한 경우 다시 시도)
+    for _ in range(RECORD_ATTEMPTS):
+        if buffers.update(count=F("count") + 1):
+            return True
+        try:
+            with transaction.atomic():
+                ReviewViewBuffer.objects.create(review_id=review_id, shard=shard, count=1)
+            return True
+        except IntegrityError:
+            continue  # 리뷰가 삭제된 경우에도 IntegrityError -> 횟수 제한
+    return False
+
+
+def flush_review_views(batch_size=FLUSH_BATCH_SIZE):
+    """
+    쌓인 조회수를 UPDATE 한 번으로 반영 (view_count = view_count + n) 후 누적 행 삭제 -> 반영한 리뷰 수
+    누적 행을 잠근 상태로 반영/삭제하므로, 그 사이의 조회는 잠금이 풀린 뒤 새 누적 행에 더해짐
+    (여러 프로세스가 동시에 실행해도 skip_locked로 서로 다른 행만 처리)
+    """
+    with transaction.atomic():
+        rows = list(
+            ReviewViewBuffer.objects.select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list("id", "review_id", "count")[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        counts = Counter()
+        for _, review_id, count in rows:
+            counts[review_id] += count
+        Review.objects.filter(pk__in=counts).update(
+            view_count=Case(
+                *[
+                    When(pk=review_id, then=F("view_count") + count)
+                    for review_id, count in counts.items()
+                ],
+                default=F("view_count"),
+                output_field=PositiveIntegerField(),
+            )
+        )
+        ReviewViewBuffer.objects.filter(id__in=[row_id for row_id, _, _ in rows]).delete()
+    return len(counts)
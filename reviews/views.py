@@ -16,9 +16,11 @@ from .serializers import (
 from django.db.models import Count, Avg
 from accounts.models import Game, Block, Notice
 from django.db.models import Case, When, Value, IntegerField
-from django.core.paginator import Paginator
 from django.http import JsonResponse
 from urllib.parse import urlencode
+from reviews.likes import set_comment_like, set_review_like
+from reviews.pagination import InvalidPage, paginate_keyset
+from reviews.view_counter import get_viewer_key, record_view
 from reviews.youtube import SearchYoutube
 import requests
 from django.core.cache import cache
@@ -52,49 +54,44 @@ class ReviewAPIView(APIView):
         )  # 기본 정렬 기준: 최신순
         category = request.query_params.get("category", None)  # 카테고리 필터링 추가
 
-        # annotate로 필드 추가 / 'related_name="likes"로 연결된 ReviewLike 모델의 is_active 필드 값이 1인 경우 추천, -1인 경우 비추천'
-        reviews = Review.objects.annotate(
-            total_likes=Count("likes", filter=Q(likes__is_active=1)),
-            total_dislikes=Count("likes", filter=Q(likes__is_active=-1)),
-        )
+        # 작성자/댓글은 미리 조회 (추천/비추천 수는 Review에 저장된 값 사용)
+        reviews = Review.objects.with_details()
 
         # 카테고리 필터링 적용
         if category:
             reviews = reviews.filter(categories__contains=[category])
 
-        # 정렬 기준 적용
+        # 정렬 기준 적용 (마지막 id는 같은 값끼리의 순서를 고정 -> cursor 페이지네이션용)
         if sort_by == "popular":  # 인기순
-            reviews = reviews.order_by("-total_likes", "-created_at")
+            ordering = [("total_likes", True), ("created_at", True), ("id", True)]
         elif sort_by == "views":  # 조회순
-            reviews = reviews.order_by("-view_count", "-created_at")
+            ordering = [("view_count", True), ("created_at", True), ("id", True)]
         else:  # 최신순
-            reviews = reviews.order_by("-created_at")
-        
-        
-        page = request.query_params.get("page", 1)  # 현재 페이지 (기본값 1)
-        paginator = Paginator(reviews, 10)  # 페이지당 10개씩 표시
+            ordering = [("created_at", True), ("id", True)]
 
-        # 현재 페이지 데이터 가져오기
+        # 페이지네이션 (cursor가 있으면 cursor 다음 10개, 없으면 page 번호 기준)
         try:
-            page_obj = paginator.page(page)
-        except Exception as e:
-            Response(
-                {"error": str(e)},
-                status=status.HTTP_400_BAD_REQUEST,
+            page_obj = paginate_keyset(
+                reviews,
+                ordering,
+                cursor=request.query_params.get("cursor"),
+                page=request.query_params.get("page", 1),  # 현재 페이지 (기본값 1)
             )
+        except InvalidPage as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not reviews.exists():
+        if not page_obj.items and page_obj.number == 1:
             return Response(
                 {"detail": "검색 결과가 없습니다."}, status=status.HTTP_404_NOT_FOUND
             )
-            
-        page_obj = paginator.page(page)
-        serializer = ReviewSerializer(page_obj, many=True)
+
+        serializer = ReviewSerializer(page_obj.items, many=True)
         return Response(
             {
                 "reviews": serializer.data,
-                "has_next": page_obj.has_next(),  # 다음 페이지 존재 여부
+                "has_next": page_obj.has_next,  # 다음 페이지 존재 여부
                 "current_page": page_obj.number,
+                "next_cursor": page_obj.next_cursor,  # 다음 페이지 조회용 cursor
             },
             status=status.HTTP_200_OK,
         )
@@ -122,19 +119,10 @@ class ReviewAPIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # 리뷰 생성
-            review = serializer.save(user=request.user)
-
-            # Game의 genres를 categories로 저장
-            review.categories = game.genres  # Game의 genres를 리뷰에 설정
-            review.save()
-
-            # 응답용 데이터 생성
-            response_data = serializer.data.copy()
-            response_data["game_name"] = game.name
-            response_data["header_image"] = game.header_image
+            # 리뷰 생성 (save()에서 Game의 genres, 이름, 헤더 이미지가 함께 저장됨)
+            serializer.save(user=request.user)
 
-            return Response(response_data, status=status.HTTP_201_CREATED)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -167,9 +155,8 @@ class ReviewDetailAPIView(APIView):
             else []
         )
 
-        # 조회수 증가 로직
-        review.view_count += 1
-        review.save()
+        # 조회수 증가 (ReviewViewBuffer에 모아 두었다가 flush_review_views 커맨드가 한 번에 반영)
+        record_view(review.id, get_viewer_key(request))
 
         serializer = ReviewSerializer(
             review, context={"request": request, "blocked_users": list(blocked_users)}
@@ -334,10 +321,9 @@ class ReviewLikeAPIView(APIView):
         serializer = ReviewLikeSerializer(data=request.data)
         if serializer.is_valid():
             # 기존 좋아요/비추천 업데이트 또는 새로 생성
-            like, created = ReviewLike.objects.update_or_create(
-                user=request.user,
-                review=review,
-                defaults={"is_active": serializer.validated_data["is_active"]},
+            # (Review의 추천/비추천 수도 같은 트랜잭션에서 갱신)
+            like, created = set_review_like(
+                request.user, review, serializer.validated_data["is_active"]
             )
             like_serializer = ReviewLikeSerializer(like)
             return Response(
@@ -362,10 +348,9 @@ class ReviewCommentLikeAPIView(APIView):
         serializer = ReviewCommentLikeSerializer(data=request.data)
         if serializer.is_valid():
             # 기존 좋아요/비추천 업데이트 또는 새로 생성
-            like, created = ReviewCommentLike.objects.update_or_create(
-                user=request.user,
-                comment=comment,
-                defaults={"is_active": serializer.validated_data["is_active"]},
+            # (ReviewComment의 추천/비추천 수도 같은 트랜잭션에서 갱신)
+            like, created = set_comment_like(
+                request.user, comment, serializer.validated_data["is_active"]
             )
             like_serializer = ReviewCommentLikeSerializer(like)
             return Response(
@@ -399,36 +384,32 @@ class ReviewSearchAPIView(APIView):
             Q(content__icontains=keyword)  # 리뷰 내용 검색
             | Q(categories__icontains=keyword)  # 카테고리 검색
             | Q(app_id__in=game_ids)  # Game 이름 검색 결과 매칭
-        ).distinct()
+        ).with_details()
 
-        if not reviews.exists():
-            return Response(
-                {"detail": "검색 결과가 없습니다."}, status=status.HTTP_404_NOT_FOUND
+        # 페이지네이션 처리 (최신순, cursor가 있으면 cursor 다음 10개)
+        try:
+            page_obj = paginate_keyset(
+                reviews,
+                [("created_at", True), ("id", True)],
+                cursor=request.query_params.get("cursor"),
+                page=request.query_params.get("page", 1),  # 기본값: 1
             )
+        except InvalidPage as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-
-        # 페이지네이션 처리
-        try:
-            page = int(request.query_params.get("page", 1))  # 기본값: 1
-            if page < 1:
-                raise ValueError
-        except ValueError:
+        if not page_obj.items and page_obj.number == 1:
             return Response(
-                {"detail": "page는 1 이상의 정수여야 합니다."},
-                status=status.HTTP_400_BAD_REQUEST,
+                {"detail": "검색 결과가 없습니다."}, status=status.HTTP_404_NOT_FOUND
             )
 
-        paginator = Paginator(reviews, 10)  # 페이지당 10개의 리뷰 표시
-        page_obj = paginator.page(page)
-
-
         # 직렬화 및 응답
-        serializer = ReviewSerializer(page_obj, many=True)
+        serializer = ReviewSerializer(page_obj.items, many=True)
         return Response(
             {
                 "reviews": serializer.data,
-                "has_next": page_obj.has_next(),  # 다음 페이지 존재 여부
+                "has_next": page_obj.has_next,  # 다음 페이지 존재 여부
                 "current_page": page_obj.number,  # 현재 페이지 번호
+                "next_cursor": page_obj.next_cursor,  # 다음 페이지 조회용 cursor
             },
             status=status.HTTP_200_OK,
         )
@@ -472,13 +453,14 @@ class GameDetailAPIView(APIView):
         video_data = searcher.search_videos(query=game.name)
 
         # 리뷰 가져오기
-        reviews = Review.objects.filter(app_id=game_id)
+        game_reviews = Review.objects.filter(app_id=game_id)
+        reviews = game_reviews.with_details()
         my_review = None
         clicked_review = None
 
         # 평균 평점과 평점 개수(리뷰들의 수로) 계산
-        average_score = reviews.aggregate(Avg('score'))['score__avg']
-        total_reviews = reviews.count()
+        average_score = game_reviews.aggregate(Avg('score'))['score__avg']
+        total_reviews = game_reviews.count()
 
         # 사용자가 인증된 경우, 자신의 리뷰 필터링
         if request.user.is_authenticated:
@@ -545,20 +527,20 @@ class GameSearchAPIView(APIView):
                     output_field=IntegerField(),
                 )
             )
-            .order_by("priority", "name")
-        )  # 우선순위와 이름으로 정렬
-        paginator = Paginator(games, 10)  # 페이지당 10개씩 표시
+        )
 
-        # 현재 페이지 데이터 가져오기
+        # 우선순위와 이름으로 정렬, cursor가 있으면 cursor 다음 10개
         try:
-            page_obj = paginator.page(page)
-        except Exception as e:
-            Response(
-                {"error": str(e)},
-                status=status.HTTP_400_BAD_REQUEST,
+            page_obj = paginate_keyset(
+                games,
+                [("priority", False), ("name", False), ("appID", False)],
+                cursor=request.query_params.get("cursor"),
+                page=page,
             )
+        except InvalidPage as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not games.exists():
+        if not page_obj.items and page_obj.number == 1:
             return Response(
                 {"detail": "검색 결과가 없습니다."}, status=status.HTTP_404_NOT_FOUND
             )
@@ -573,10 +555,11 @@ class GameSearchAPIView(APIView):
                         "header_image": game.header_image,
                         "genres": game.genres_kr,
                     }
-                    for game in page_obj
+                    for game in page_obj.items
                 ],
-                "has_next": page_obj.has_next(),  # 다음 페이지 존재 여부
+                "has_next": page_obj.has_next,  # 다음 페이지 존재 여부
                 "current_page": page_obj.number,
+                "next_cursor": page_obj.next_cursor,  # 다음 페이지 조회용 cursor
             },
             status=status.HTTP_200_OK,
         )
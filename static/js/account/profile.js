@@ -1,5 +1,7 @@
 $(document).ready(function() {
     const access_token = sessionStorage.getItem('access_token')
+    // 스팀 동기화 중일 때 자동 새로고침 최대 횟수 (5초 간격)
+    const STEAM_SYNC_MAX_RELOADS = 6
 
     function steam_profile_action(){
         if(confirm("스팀 프로필 이미지를 가져오시겠습니까?")){
@@ -69,6 +71,23 @@ $(document).ready(function() {
             }
             const owned_games = data.owned_games;
             const div_owned_games = $("div.owned_game")
+            const div_recent_games = $("div.recent_game")
+            if(data.steam_syncing){
+                // 스팀 연동 직후 동기화 중 - 잠시 후 다시 조회 (최대 STEAM_SYNC_MAX_RELOADS번)
+                const reloads = Number(sessionStorage.getItem('steam_sync_reloads') || 0)
+                if(reloads < STEAM_SYNC_MAX_RELOADS){
+                    div_owned_games.append(`<div>스팀 정보를 동기화하는 중입니다...</div>`)
+                    div_recent_games.append(`<div>스팀 정보를 동기화하는 중입니다...</div>`)
+                    sessionStorage.setItem('steam_sync_reloads', reloads + 1)
+                    setTimeout(function(){ location.reload() }, 5000)
+                } else {
+                    // 동기화가 오래 걸리는 경우 - 자동 새로고침 중단
+                    div_owned_games.append(`<div>스팀 정보를 동기화하는 중입니다. 잠시 후 다시 확인해 주세요.</div>`)
+                    div_recent_games.append(`<div>스팀 정보를 동기화하는 중입니다. 잠시 후 다시 확인해 주세요.</div>`)
+                }
+                return
+            }
+            sessionStorage.removeItem('steam_sync_reloads')
             if(owned_games !== undefined && data.owned_games.game_count){
                 for (let i = 0; i < owned_games["games"].length; i++) {
                     const game = owned_games["games"][i]
@@ -89,7 +108,6 @@ $(document).ready(function() {
             }
             
             const recent_games = data.recent_games;
-            const div_recent_games = $("div.recent_game")
             if(recent_games !== undefined && data.recent_games.total_count){
                 for (let i = 0; i < recent_games["games"].length; i++) {
                     const game = recent_games["games"][i]
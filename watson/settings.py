@@ -210,5 +210,19 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
         'LOCATION': 'cache_location/',  # 캐시 저장 경로
-    }
-}
\ No newline at end of file
+    },
+    # 리뷰 중복 조회 확인용 - 모든 워커 프로세스가 공유하는 캐시여야 함
+    # (프로세스별 캐시(locmemcache)를 쓰면 같은 사용자가 워커마다 한 번씩 중복으로 셈)
+    # 기본값은 default와 같은 파일 캐시 (사용자별 키가 많으므로 경로만 분리)
+    # 서버가 여러 대이면 REVIEW_VIEW_CACHE_URL에 redis:// 등 공용 캐시 지정
+    'review_views': env.cache_url(
+        'REVIEW_VIEW_CACHE_URL',
+        default=f'filecache://{BASE_DIR / "cache_location" / "review_views"}/?max_entries=100000',
+    ),
+}
+
+# 추천용 게임 카탈로그 스냅샷 (export_catalogue 커맨드로 생성)
+CATALOGUE_SNAPSHOT_DIR = env("CATALOGUE_SNAPSHOT_DIR", default=str(BASE_DIR / "catalogue_snapshot"))
+
+# 협업 필터링 챗봇을 사용하기 위한 최소 유저 수
+COLLABORATIVE_MIN_USERS = env.int("COLLABORATIVE_MIN_USERS", default=30)
@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'watson.settings')
 
 application = get_wsgi_application()
+
+# 추천용 카탈로그 행렬 미리 로드 (스냅샷이 있으면 mmap으로 바로 로드)
+try:
+    from accounts.recommend import CatalogueMatrix
+
+    CatalogueMatrix.get()
+except Exception as e:
+    print(f"카탈로그 행렬 미리 로드 실패: {e!r}")